@@ -0,0 +1,134 @@
+import sys
+from collections.abc import Iterable, Mapping
+from typing import Any, ClassVar
+
+from stix2.base import _STIXBase
+from stix2.v20.common import ExternalReference, KillChainPhase
+
+
+class StixCompactor:
+    """Reduce the memory held by parsed STIX objects.
+
+    String values are interned, and identical external references and kill chain
+    phases are replaced by a single shared instance. STIX objects are immutable
+    once parsed, so sharing them between objects is safe.
+    """
+
+    SKIP_KEYS: ClassVar[frozenset[str]] = frozenset({"description"})
+    SHARED_TYPES: ClassVar[tuple[type, ...]] = (ExternalReference, KillChainPhase)
+
+    def __init__(self) -> None:
+        self._shared: dict[tuple, _STIXBase] = {}
+        self.objects: int = 0
+        self.shared_hits: int = 0
+
+    @staticmethod
+    def _inner(stix_obj: _STIXBase | dict[str, Any]) -> dict[str, Any]:
+        # Custom types without a registered class are parsed as plain dicts.
+        if isinstance(stix_obj, _STIXBase):
+            return stix_obj._inner  # noqa: SLF001
+        return stix_obj
+
+    def _compact_value(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return sys.intern(value)
+        if isinstance(value, list):
+            return [self._compact_value(i) for i in value]
+        if isinstance(value, self.SHARED_TYPES):
+            return self._share(value)
+        return value
+
+    def _share(self, stix_obj: _STIXBase) -> _STIXBase:
+        inner = self._inner(stix_obj)
+        for key, value in inner.items():
+            inner[key] = self._compact_value(value)
+        try:
+            share_key = (type(stix_obj), tuple(sorted(inner.items())))
+            shared = self._shared.setdefault(share_key, stix_obj)
+        except TypeError:
+            return stix_obj
+        if shared is not stix_obj:
+            self.shared_hits += 1
+        return shared
+
+    def compact(self, stix_obj: _STIXBase | dict[str, Any]) -> None:
+        inner = self._inner(stix_obj)
+        for key, value in inner.items():
+            if key in self.SKIP_KEYS:
+                continue
+            inner[key] = self._compact_value(value)
+        self.objects += 1
+
+    def __call__(
+        self, stix_objs: Iterable[_STIXBase | dict[str, Any]]
+    ) -> dict[str, int]:
+        for stix_obj in stix_objs:
+            self.compact(stix_obj)
+        return {
+            "objects": self.objects,
+            "shared_structures": len(self._shared),
+            "shared_hits": self.shared_hits,
+        }
+
+
+def _deep_sizeof(obj: Any, seen: dict[int, Any], opaque: tuple[type, ...] = ()) -> int:
+    # Sizes are attributed to the first owner that reaches them, so shared
+    # substructures and interned strings are only counted once. `seen` keeps the
+    # objects alive so that the IDs of temporaries are not reused while measuring.
+    obj_id = id(obj)
+    if obj_id in seen:
+        return 0
+    seen[obj_id] = obj
+    size = sys.getsizeof(obj)
+    if isinstance(obj, opaque):
+        return size
+    if isinstance(obj, _STIXBase):
+        size += _deep_sizeof(vars(obj), seen, opaque)
+    elif isinstance(obj, Mapping):
+        for key, value in obj.items():
+            size += _deep_sizeof(key, seen, opaque) + _deep_sizeof(value, seen, opaque)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for i in obj:
+            size += _deep_sizeof(i, seen, opaque)
+    return size
+
+
+def deep_sizeof(obj: Any, opaque: tuple[type, ...] = ()) -> int:
+    return _deep_sizeof(obj, {}, opaque)
+
+
+def memory_report(
+    stix_objs: Iterable[_STIXBase],
+    extra: Mapping[str, Any] | None = None,
+    opaque: tuple[type, ...] = (),
+) -> dict[str, dict[str, int]]:
+    """Break down the retained size of STIX objects by STIX type.
+
+    Args:
+        stix_objs (Iterable[_STIXBase]):
+            The STIX objects to measure.
+        extra (Mapping[str, Any], optional):
+            Additional named structures, such as indexes, to measure after the
+            STIX objects. Defaults to None.
+        opaque (tuple[type, ...], optional):
+            Types whose instances are counted by their own size only, without
+            traversing their contents. Use for lazy mappings that would load
+            objects when iterated. Defaults to ().
+
+    Returns:
+        dict[str, dict[str, int]]:
+            Mapping of STIX types (and `extra` names) to object counts and
+            retained sizes in bytes, largest first.
+    """
+    seen: dict[int, Any] = {}
+    report: dict[str, dict[str, int]] = {}
+    for stix_obj in stix_objs:
+        entry = report.setdefault(stix_obj.get("type", ""), {"count": 0, "bytes": 0})
+        entry["count"] += 1
+        entry["bytes"] += _deep_sizeof(stix_obj, seen, opaque)
+    for name, obj in (extra or {}).items():
+        size = _deep_sizeof(
+            vars(obj) if hasattr(obj, "__dict__") else obj, seen, opaque
+        )
+        report[name] = {"count": 1, "bytes": size}
+    return dict(sorted(report.items(), key=lambda item: -item[1]["bytes"]))
@@ -48,6 +48,7 @@ class StixProcessor:
         self.technique_keep_keys: tuple[str, ...] = self.DEFAULT_TECHNIQUE_KEEP_KEYS
         self.malware_keep_keys: tuple[str, ...] = self.DEFAULT_MALWARE_KEEP_KEYS
         self.tool_keep_keys: tuple[str, ...] = self.DEFAULT_TOOL_KEEP_KEYS
+        self.technique_phases: Mapping[str, dict[str, list[str]]] = {}
 
     @classmethod
     def _clean_stix_dict(cls, __obj: T) -> T:
@@ -140,11 +141,23 @@ class StixProcessor:
         )
         if keep_keys is None or "kill_chain_phases" in keep_keys:
             kill_chain_phases: dict[str, list[str]] | list[str] = (
-                self.kill_chain_phases(technique, kill_chain=kill_chain)
+                self._precomputed_kill_chain_phases(technique, kill_chain=kill_chain)
             )
             technique_dict["kill_chain_phases"] = kill_chain_phases
         return technique_dict
 
+    def _precomputed_kill_chain_phases(
+        self, technique: AttackPattern, kill_chain: str | None = None
+    ) -> dict[str, list[str]] | list[str]:
+        phases: dict[str, list[str]] | None = self.technique_phases.get(
+            technique.get("id", ""), None
+        )
+        if phases is None:
+            return self.kill_chain_phases(technique, kill_chain=kill_chain)
+        if kill_chain:
+            return phases.get(kill_chain, [])[:]
+        return {name: phase_names[:] for name, phase_names in phases.items()}
+
     def malware_to_dict(
         self, malware: Malware, keep_keys: Sequence[str] | None = None
     ) -> dict:
@@ -0,0 +1,390 @@
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping
+from os import PathLike
+from pathlib import Path
+from typing import Any, ClassVar
+
+import stix2
+from stix2.base import _STIXBase
+from stix2.datastore import DataSource, DataStoreMixin
+from stix2.datastore.filters import Filter, FilterSet, apply_common_filters
+from stix2.serialization import serialize
+
+from attck_stix_agent.util import make_file_parent, to_path
+
+SCHEMA = """
+CREATE TABLE objects (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    modified TEXT NOT NULL,
+    active INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX objects_type ON objects (type, active);
+CREATE TABLE relationships (
+    id TEXT PRIMARY KEY,
+    relationship_type TEXT NOT NULL,
+    source_ref TEXT NOT NULL,
+    target_ref TEXT NOT NULL,
+    active INTEGER NOT NULL
+);
+CREATE INDEX relationships_source ON relationships (source_ref, relationship_type);
+CREATE INDEX relationships_target ON relationships (target_ref, relationship_type);
+CREATE TABLE metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _is_active(stix_obj: Mapping) -> bool:
+    return not (stix_obj.get("revoked", False) or stix_obj.get("x_mitre_deprecated"))
+
+
+def _placeholders(count: int) -> str:
+    return ",".join("?" * count)
+
+
+class SQLiteSource(DataSource):
+    """Read-only STIX data source backed by a SQLite database.
+
+    Objects are stored as serialized JSON and parsed on first access. Parsed
+    objects are kept in a bounded LRU cache, so memory use depends on the cache
+    size rather than on the size of the bundle. Equality and membership filters on
+    `id`, `type` and the relationship properties are answered by the database
+    indexes; any other filter is applied to the parsed candidates.
+    """
+
+    DEFAULT_CACHE_SIZE: ClassVar[int] = 1024
+    # Filter properties answered by the database, and the columns holding them.
+    INDEXED_PROPERTIES: ClassVar[dict[str, str]] = {
+        "id": "o.id",
+        "type": "o.type",
+        "relationship_type": "r.relationship_type",
+        "source_ref": "r.source_ref",
+        "target_ref": "r.target_ref",
+    }
+
+    def __init__(
+        self,
+        db_path: str | PathLike,
+        stix_version: str | None = None,
+        allow_custom: bool = True,
+        cache_size: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.db_path: Path = to_path(db_path)
+        if not self.db_path.is_file():
+            msg = f"SQLite store not found: '{self.db_path}'"
+            raise FileNotFoundError(msg)
+        self.allow_custom = allow_custom
+        self.cache_size: int = cache_size or self.DEFAULT_CACHE_SIZE
+        self._conn = sqlite3.connect(
+            f"{self.db_path.as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, _STIXBase] = OrderedDict()
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self.metadata: dict[str, str] = dict(
+            self._fetch("SELECT key, value FROM metadata")
+        )
+        self.stix_version: str = stix_version or self.metadata.get(
+            "stix_version", "2.0"
+        )
+
+    def _fetch(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            self._cache.clear()
+
+    def _parse(self, data: str) -> _STIXBase:
+        return stix2.parse(
+            data, allow_custom=self.allow_custom, version=self.stix_version
+        )
+
+    def _hydrate(self, stix_id: str, data: str | None = None) -> _STIXBase | None:
+        with self._lock:
+            stix_obj = self._cache.get(stix_id, None)
+            if stix_obj is not None:
+                self._cache.move_to_end(stix_id)
+                self.cache_hits += 1
+                return stix_obj
+        if data is None:
+            rows = self._fetch("SELECT data FROM objects WHERE id = ?", (stix_id,))
+            if not rows:
+                return None
+            data = rows[0][0]
+        stix_obj = self._parse(data)
+        with self._lock:
+            self.cache_misses += 1
+            self._cache[stix_id] = stix_obj
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return stix_obj
+
+    def cached_objects(self) -> list[_STIXBase]:
+        """The parsed objects currently held in the cache."""
+        with self._lock:
+            return list(self._cache.values())
+
+    def cache_info(self) -> dict[str, int]:
+        return {
+            "size": len(self._cache),
+            "max_size": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+        }
+
+    def _where(self, query: FilterSet) -> tuple[str, list[Any], bool]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        needs_relationships = False
+        for filter_ in query:
+            column = self.INDEXED_PROPERTIES.get(filter_.property, None)
+            if column is None:
+                continue
+            if filter_.op == "=" and isinstance(filter_.value, str):
+                clauses.append(f"{column} = ?")
+                params.append(filter_.value)
+            elif filter_.op == "in" and isinstance(filter_.value, tuple):
+                clauses.append(f"{column} IN ({_placeholders(len(filter_.value))})")
+                params.extend(filter_.value)
+            else:
+                continue
+            needs_relationships |= column.startswith("r.")
+        return (" AND ".join(clauses) or "1", params, needs_relationships)
+
+    def _filter(
+        self, stix_objs: Iterable[_STIXBase], query: Iterable[Filter]
+    ) -> list[_STIXBase]:
+        return list(apply_common_filters(stix_objs, query))
+
+    def _all_filters(self, _composite_filters: FilterSet | None) -> list[Filter]:
+        return [*(_composite_filters or []), *self.filters]
+
+    def get(
+        self, stix_id: str, _composite_filters: FilterSet | None = None
+    ) -> _STIXBase | None:
+        stix_obj = self._hydrate(stix_id)
+        if stix_obj is None:
+            return None
+        return next(
+            iter(self._filter([stix_obj], self._all_filters(_composite_filters))),
+            None,
+        )
+
+    def all_versions(
+        self, stix_id: str, _composite_filters: FilterSet | None = None
+    ) -> list[_STIXBase]:
+        # Only the latest version of each object is stored.
+        stix_obj = self.get(stix_id, _composite_filters=_composite_filters)
+        return [] if stix_obj is None else [stix_obj]
+
+    def query(
+        self,
+        query: Iterable[Filter] | None = None,
+        _composite_filters: FilterSet | None = None,
+    ) -> list[_STIXBase]:
+        query = FilterSet(query)
+        if self.filters:
+            query.add(self.filters)
+        if _composite_filters:
+            query.add(_composite_filters)
+
+        where, params, needs_relationships = self._where(query)
+        join = "JOIN relationships r ON r.id = o.id" if needs_relationships else ""
+        # Only column names and placeholders are interpolated.
+        sql = f"SELECT o.id, o.data FROM objects o {join} WHERE {where}"  # noqa: S608
+        rows = self._fetch(sql, params)
+        stix_objs = (self._hydrate(stix_id, data) for stix_id, data in rows)
+        return self._filter(stix_objs, query)
+
+    def object_versions(self) -> list[tuple[str, str]]:
+        """`(id, modified)` of every stored object, ordered by ID."""
+        return self._fetch("SELECT id, modified FROM objects ORDER BY id")
+
+    def active_ids(self) -> list[str]:
+        """IDs of the active objects other than relationships."""
+        return [
+            row[0]
+            for row in self._fetch(
+                "SELECT id FROM objects WHERE active AND type != 'relationship'"
+            )
+        ]
+
+    def iter_active(self, batch_size: int = 500) -> Iterator[tuple[str, _STIXBase]]:
+        """Parse every active object other than relationships, one at a time.
+
+        Objects are not added to the cache, so a full scan does not evict the
+        objects that are in use.
+        """
+        active_ids = self.active_ids()
+        for idx in range(0, len(active_ids), batch_size):
+            batch = active_ids[idx : idx + batch_size]
+            placeholders = _placeholders(len(batch))
+            sql = f"SELECT id, data FROM objects WHERE id IN ({placeholders})"  # noqa: S608
+            for stix_id, data in self._fetch(sql, batch):
+                yield (stix_id, self._parse(data))
+
+    def relationship_rows(self) -> list[tuple[str, str, str, str]]:
+        """`(id, source_ref, relationship_type, target_ref)` of active relationships."""
+        return self._fetch(
+            "SELECT id, source_ref, relationship_type, target_ref"
+            " FROM relationships WHERE active"
+        )
+
+
+class SQLiteObjects(Mapping[str, _STIXBase]):
+    """Lazy mapping of the active objects in a `SQLiteSource` by STIX ID.
+
+    Lookups go through the source's object cache. Iterating over `items()` parses
+    objects one at a time without caching them.
+    """
+
+    def __init__(self, source: SQLiteSource) -> None:
+        self._source = source
+        self._ids: frozenset[str] = frozenset(source.active_ids())
+
+    def __getitem__(self, stix_id: str) -> _STIXBase:
+        stix_obj = self._source.get(stix_id) if stix_id in self._ids else None
+        if stix_obj is None:
+            raise KeyError(stix_id)
+        return stix_obj
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, stix_id: object) -> bool:
+        return stix_id in self._ids
+
+    def items(self) -> Iterator[tuple[str, _STIXBase]]:  # pyright: ignore [reportIncompatibleMethodOverride]
+        return self._source.iter_active()
+
+
+class SQLiteStore(DataStoreMixin):
+    """Read-only STIX data store persisted to a SQLite database.
+
+    Build the database with `SQLiteStore.create`, then open it as many times as
+    needed, e.g. once per process, without parsing the bundle again.
+    """
+
+    def __init__(
+        self,
+        db_path: str | PathLike,
+        stix_version: str | None = None,
+        allow_custom: bool = True,
+        cache_size: int | None = None,
+    ) -> None:
+        super().__init__(
+            source=SQLiteSource(
+                db_path,
+                stix_version=stix_version,
+                allow_custom=allow_custom,
+                cache_size=cache_size,
+            )
+        )
+
+    @property
+    def metadata(self) -> dict[str, str]:
+        return self.source.metadata
+
+    @property
+    def objects(self) -> SQLiteObjects:
+        return SQLiteObjects(self.source)
+
+    @classmethod
+    def create(
+        cls,
+        db_path: str | PathLike,
+        stix_objs: Iterable[_STIXBase],
+        metadata: Mapping[str, str] | None = None,
+        **kwargs: Any,
+    ) -> "SQLiteStore":
+        """Write STIX objects to a new SQLite database and open it.
+
+        The database is written to a uniquely named file next to `db_path` and
+        moved into place once complete, replacing any existing database. When
+        several versions of an object are given, only the most recently modified
+        one is kept.
+
+        Args:
+            db_path (str | PathLike):
+                Location of the database file.
+            stix_objs (Iterable[_STIXBase]):
+                The STIX objects to store.
+            metadata (Mapping[str, str], optional):
+                Key/value pairs stored alongside the objects, e.g. the source the
+                objects were imported from. Defaults to None.
+            **kwargs:
+                Passed to `SQLiteStore`.
+
+        Returns:
+            SQLiteStore: The store, opened read-only.
+        """
+        db_path = to_path(db_path)
+        make_file_parent(db_path)
+        # A unique file per writer, so concurrent writers never share one.
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f"{db_path.name}.", suffix=".tmp", dir=db_path.parent
+        )
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            conn = sqlite3.connect(tmp_path)
+            try:
+                with conn:
+                    conn.executescript(SCHEMA)
+                    for stix_obj in stix_objs:
+                        cls._insert(conn, stix_obj)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                        (metadata or {}).items(),
+                    )
+            finally:
+                conn.close()
+            tmp_path.replace(db_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return cls(db_path, **kwargs)
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, stix_obj: _STIXBase) -> None:
+        stix_id: str = stix_obj["id"]
+        modified = str(stix_obj.get("modified", ""))
+        rows = conn.execute(
+            "SELECT modified FROM objects WHERE id = ?", (stix_id,)
+        ).fetchall()
+        if rows and rows[0][0] >= modified:
+            return
+        active = _is_active(stix_obj)
+        conn.execute(
+            "INSERT OR REPLACE INTO objects (id, type, modified, active, data)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (stix_id, stix_obj["type"], modified, active, serialize(stix_obj)),
+        )
+        if stix_obj["type"] == "relationship":
+            conn.execute(
+                "INSERT OR REPLACE INTO relationships"
+                " (id, relationship_type, source_ref, target_ref, active)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    stix_id,
+                    stix_obj["relationship_type"],
+                    stix_obj["source_ref"],
+                    stix_obj["target_ref"],
+                    active,
+                ),
+            )
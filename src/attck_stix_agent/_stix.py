@@ -1,7 +1,10 @@
+import sqlite3
 from functools import partial
 from os import PathLike
 from pathlib import Path
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Literal
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 import requests
 import stix2
@@ -9,22 +12,39 @@ from requests.exceptions import JSONDecodeError
 from stix2 import MemoryStore
 from stix2.v20.bundle import Bundle
 
-from attck_stix_agent.exceptions import StixImportError
-from attck_stix_agent.util import make_file_parent, read_and_parse_file, to_path
+from attck_stix_agent._sqlite import SQLiteStore
+from attck_stix_agent.exceptions import StixChecksumError, StixImportError
+from attck_stix_agent.util import (
+    COMPRESSED_SUFFIXES,
+    file_checksum,
+    find_checksum,
+    make_file_parent,
+    read_and_parse_file,
+    to_path,
+)
 from attck_stix_agent.validators import _is_url_valid
 
 DEFAULT_STIX_VERSION = "2.0"
 
+StixSourceKind = Literal["url", "file"]
+
 
 class StixImporter:
     DEFAULT_STIX_VERSION: ClassVar[str] = DEFAULT_STIX_VERSION
+    URL_SCHEMES: ClassVar[tuple[str, ...]] = ("http", "https")
+    FILE_SCHEMES: ClassVar[tuple[str, ...]] = ("file",)
+    SNAPSHOT_SCHEMES: ClassVar[tuple[str, ...]] = ("snapshot",)
 
     def __init__(
-        self, stix_version: str | None = None, allow_custom: bool = False
+        self,
+        stix_version: str | None = None,
+        allow_custom: bool = False,
+        require_checksum: bool = False,
     ) -> None:
         if stix_version:
             self.stix_version = stix_version
         self.allow_custom = allow_custom
+        self.require_checksum = require_checksum
         self.cache_src: bool = True
         self._cache_path: Path | None = None
 
@@ -39,10 +59,14 @@ class StixImporter:
             return
         self._cache_path = to_path(__path)
 
+    @property
+    def snapshot_name(self) -> str:
+        return f"cache-stix-v{self.stix_version}"
+
     def _cache_stix_src(self, data: Bundle) -> None:
         if not self.cache_src or self.cache_path is None:
             return
-        stix_file_name = f"cache-stix-v{self.stix_version}.json"
+        stix_file_name = f"{self.snapshot_name}.json"
         stix_file = self.cache_path.joinpath(stix_file_name)
         make_file_parent(stix_file)
         if isinstance(data, Bundle):
@@ -60,7 +84,8 @@ class StixImporter:
         self._stix_version = version
 
     def _from_url(self, stix_url: str) -> dict:
-        if not _is_url_valid(stix_url, check_host=True):
+        # The request itself reports unreachable hosts, so skip the DNS probe.
+        if not _is_url_valid(stix_url, check_host=False):
             msg = f"invalid url: '{stix_url}'"
             raise ValueError(msg)
 
@@ -85,9 +110,22 @@ class StixImporter:
             raise StixImportError(msg)
         return json_dict
 
+    def _verify_checksum(self, stix_path: str | PathLike) -> None:
+        expected = find_checksum(stix_path)
+        if expected is None:
+            if self.require_checksum:
+                msg = f"no checksum found for '{stix_path}'"
+                raise StixChecksumError(msg)
+            return
+        actual = file_checksum(stix_path)
+        if actual != expected:
+            msg = f"checksum mismatch for '{stix_path}': {actual} != {expected}"
+            raise StixChecksumError(msg)
+
     def _from_file(
         self, stix_path: str | PathLike, allow_custom: bool = True
     ) -> bytes | str | Any:
+        self._verify_checksum(stix_path)
         _stix_parser = partial(
             stix2.parse, allow_custom=allow_custom, version=self.stix_version
         )
@@ -108,23 +146,87 @@ class StixImporter:
         )
         return stix_obj
 
+    def _snapshot_path(self, name: str) -> Path:
+        if self.cache_path is None:
+            msg = "snapshot sources require a cache path"
+            raise ValueError(msg)
+        name = name or self.snapshot_name
+        candidates = [self.cache_path.joinpath(name)]
+        candidates.extend(
+            self.cache_path.joinpath(f"{name}.json{suffix}")
+            for suffix in ("", *COMPRESSED_SUFFIXES)
+        )
+        for candidate in candidates:
+            if candidate.is_file():
+                return candidate
+        msg = f"snapshot not found: '{name}'"
+        raise FileNotFoundError(msg)
+
+    def _resolve_source(self, __src: str | PathLike) -> tuple[StixSourceKind, str]:
+        """Resolve a STIX source to a URL or local file path by its scheme.
+
+        `http(s)://` sources are fetched, `file://` sources and scheme-less
+        paths are read from disk, and `snapshot://[name]` sources are read from
+        the cache path. No network access is made while resolving.
+
+        Raises:
+            ValueError: The source scheme is not supported.
+
+        Returns:
+            tuple[StixSourceKind, str]: The source kind and its location.
+        """
+        if isinstance(__src, PathLike):
+            return ("file", str(to_path(__src)))
+
+        parsed = urlparse(__src)
+        scheme = parsed.scheme.lower()
+        if scheme in self.URL_SCHEMES:
+            return ("url", __src)
+        if scheme in self.FILE_SCHEMES:
+            return ("file", url2pathname(parsed.path))
+        if scheme in self.SNAPSHOT_SCHEMES:
+            name = f"{parsed.netloc}{parsed.path}".strip("/")
+            return ("file", str(self._snapshot_path(name)))
+        # Windows drive letters parse as single-character schemes.
+        if not scheme or len(scheme) == 1:
+            return ("file", __src)
+        msg = f"unsupported STIX source scheme: '{scheme}'"
+        raise ValueError(msg)
+
+    def source_checksum(self, __src: str | PathLike) -> str | None:
+        """Identify the current content of a STIX source without importing it.
+
+        Local files are hashed with `file_checksum`. For URLs, the `ETag` the
+        server reports for a `HEAD` request is used instead of fetching the
+        content.
+
+        Returns:
+            str | None: The checksum, or None if the source does not provide one.
+        """
+        kind, location = self._resolve_source(__src)
+        if kind == "file":
+            return f"sha256:{file_checksum(location)}"
+        try:
+            with requests.head(location, timeout=60, allow_redirects=True) as resp:
+                resp.raise_for_status()
+                etag = resp.headers.get("ETag")
+        except requests.RequestException:
+            return None
+        return f"etag:{etag}" if etag else None
+
     def _import_stix(self, __src, allow_custom: bool = True):
         stix_data: dict | Bundle | None = None
 
-        if isinstance(__src, str):
-            try:
-                json_data = self._from_url(__src)
-                stix_data = self._parse(json_data, allow_custom=allow_custom)
-            except StixImportError:
-                pass
-            except ValueError:
-                pass
-            else:
-                return stix_data
-            stix_data = self._from_file(__src, allow_custom=allow_custom)
-        else:
+        if not isinstance(__src, (str, PathLike)):
             raise NotImplementedError
 
+        kind, location = self._resolve_source(__src)
+        if kind == "url":
+            json_data = self._from_url(location)
+            stix_data = self._parse(json_data, allow_custom=allow_custom)
+        else:
+            stix_data = self._from_file(location, allow_custom=allow_custom)
+
         if stix_data is None:
             raise TypeError
         if isinstance(stix_data, Bundle):
@@ -134,14 +236,63 @@ class StixImporter:
         else:
             raise TypeError
 
-    def __call__(self, __src) -> MemoryStore:
+    def _import_bundle(self, __src) -> Bundle:
         try:
             stix_data = self._import_stix(__src, allow_custom=self.allow_custom)
+        except StixImportError:
+            raise
         except Exception as e:
             msg = "Failed to import STIX content"
             raise StixImportError(msg) from e
-        else:
-            self._cache_stix_src(stix_data)
-            memory_store = MemoryStore()
-            memory_store.add(stix_data)
-            return memory_store
+        self._cache_stix_src(stix_data)
+        return stix_data
+
+    def __call__(self, __src) -> MemoryStore:
+        stix_data = self._import_bundle(__src)
+        memory_store = MemoryStore()
+        memory_store.add(stix_data)
+        return memory_store
+
+    def to_sqlite(
+        self,
+        __src,
+        db_path: str | PathLike,
+        cache_size: int | None = None,
+        checksum: str | None = None,
+    ) -> SQLiteStore:
+        """Import STIX content into a SQLite database, see `SQLiteStore`.
+
+        The bundle is parsed in memory once, while it is written to the database.
+        The returned store reads objects back from the database as needed.
+
+        Args:
+            db_path (str | PathLike):
+                Location of the database file. An existing database is replaced.
+            cache_size (int, optional):
+                Maximum number of parsed objects the store keeps in memory.
+                Defaults to None (`SQLiteSource.DEFAULT_CACHE_SIZE`).
+            checksum (str, optional):
+                Checksum of the source recorded in the database metadata.
+                Defaults to None (computed with `source_checksum`).
+
+        Returns:
+            SQLiteStore: The store.
+        """
+        if checksum is None:
+            checksum = self.source_checksum(__src)
+        stix_data = self._import_bundle(__src)
+        metadata = {"source": str(__src), "stix_version": self.stix_version}
+        if checksum is not None:
+            metadata["checksum"] = checksum
+        try:
+            return SQLiteStore.create(
+                db_path,
+                stix_data.get("objects", []),
+                metadata=metadata,
+                stix_version=self.stix_version,
+                allow_custom=self.allow_custom,
+                cache_size=cache_size,
+            )
+        except sqlite3.Error as e:
+            msg = f"Failed to write STIX content to '{db_path}'"
+            raise StixImportError(msg) from e
@@ -1,9 +1,44 @@
+import os
+
+STIX_SRC_ENV = "ATTCK_STIX_SRC"
+STIX_SQLITE_ENV = "ATTCK_STIX_SQLITE"
+OBJECT_CACHE_SIZE_ENV = "ATTCK_STIX_OBJECT_CACHE_SIZE"
+STIX_CACHE_PATH_ENV = "ATTCK_STIX_CACHE_PATH"
+REQUIRE_CHECKSUM_ENV = "ATTCK_STIX_REQUIRE_CHECKSUM"
+HTTP_CACHE_ENV = "ATTCK_STIX_HTTP_CACHE"
+
+
 def serve_api(
-    host: str = "127.0.0.1", port: int = 8000, log_level: str = "info"
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    log_level: str = "info",
+    warm_caches: bool = True,
+    stix_src: str | None = None,
+    sqlite_path: str | None = None,
+    object_cache_size: int | None = None,
+    cache_path: str | None = None,
+    require_checksum: bool = False,
+    http_cache: bool = True,
 ) -> None:
     from uvicorn import Config, Server
 
-    from attck_stix_agent.api.api import api
+    if stix_src is not None:
+        os.environ[STIX_SRC_ENV] = stix_src
+    if sqlite_path is not None:
+        os.environ[STIX_SQLITE_ENV] = sqlite_path
+    if object_cache_size is not None:
+        os.environ[OBJECT_CACHE_SIZE_ENV] = str(object_cache_size)
+    if cache_path is not None:
+        os.environ[STIX_CACHE_PATH_ENV] = cache_path
+    if require_checksum:
+        os.environ[REQUIRE_CHECKSUM_ENV] = "1"
+    if not http_cache:
+        os.environ[HTTP_CACHE_ENV] = "0"
+
+    from attck_stix_agent.api.api import api, stix_manager
+
+    if warm_caches:
+        stix_manager.warm_caches()
 
     api_conf = Config(app=api, host=host, port=port, log_level=log_level)
     api_server = Server(config=api_conf)
@@ -0,0 +1,205 @@
+import gzip
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable, Collection
+from typing import Any, ClassVar, NamedTuple
+
+from fastapi import Request, Response
+from starlette.routing import Match
+
+
+def _brotli_compress(data: bytes) -> bytes | None:
+    try:
+        import brotli  # noqa: PLC0415  # pyright: ignore [reportMissingImports]
+    except ImportError:
+        return None
+    return brotli.compress(data)
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    media_type: str | None
+    bodies: dict[str, bytes]
+
+    @property
+    def size(self) -> int:
+        return sum(len(body) for body in self.bodies.values())
+
+    def coding_etag(self, coding: str) -> str:
+        """Strong validator of the body in `coding`."""
+        if coding == "identity":
+            return self.etag
+        return f'{self.etag[:-1]}-{coding}"'
+
+
+class HttpCache:
+    """Validator and rendered-body cache for idempotent API responses.
+
+    ETags are derived from a version token supplied by the caller (the loaded
+    dataset and any state that changes responses), the request path and the
+    query parameters the matched route declares, so unknown parameters neither
+    change the tag nor add entries. Each content-coding of a body has its own
+    strong ETag. Matching `If-None-Match` requests are answered with 304 only
+    once a successful response is cached for the tag, without running the
+    endpoint. Rendered bodies are kept alongside their gzip and brotli encodings,
+    compressed once when they are first stored, and the least recently used
+    entries are evicted once all bodies together exceed `max_bytes`.
+    """
+
+    DEFAULT_CACHE_CONTROL: ClassVar[str] = "public, no-cache"
+    DEFAULT_MAX_BYTES: ClassVar[int] = 32 * 1024 * 1024
+    MIN_COMPRESS_SIZE: ClassVar[int] = 512
+    COMPRESSORS: ClassVar[dict[str, Callable[[bytes], bytes | None]]] = {
+        "br": _brotli_compress,
+        "gzip": lambda data: gzip.compress(data, compresslevel=6),
+    }
+
+    def __init__(
+        self,
+        version: Callable[[], str],
+        max_bytes: int | None = None,
+        cache_control: str | None = None,
+        exclude: Collection[str] = (),
+    ) -> None:
+        self.version = version
+        self.exclude: frozenset[str] = frozenset(exclude)
+        self.max_bytes: int = max_bytes or self.DEFAULT_MAX_BYTES
+        self.cache_control: str = cache_control or self.DEFAULT_CACHE_CONTROL
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size: int = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @staticmethod
+    def declared_params(request: Request) -> frozenset[str] | None:
+        """Query parameters declared by the route `request` matches, if any."""
+        for route in request.app.routes:
+            match, _ = route.matches(request.scope)
+            if match == Match.FULL:
+                dependant = getattr(route, "dependant", None)
+                if dependant is None:
+                    return None
+                return frozenset(param.alias for param in dependant.query_params)
+        return None
+
+    def etag(
+        self,
+        request: Request,
+        params: Collection[str] = (),
+        version: str | None = None,
+    ) -> str:
+        digest = hashlib.sha256()
+        digest.update((version if version is not None else self.version()).encode())
+        digest.update(b"\0")
+        digest.update(request.url.path.encode())
+        for key, value in sorted(request.query_params.multi_items()):
+            if key in params:
+                digest.update(f"\0{key}={value}".encode())
+        return f'"{digest.hexdigest()[:32]}"'
+
+    @staticmethod
+    def etag_matches(request: Request, etag: str) -> bool:
+        if_none_match = request.headers.get("if-none-match", "")
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            tag = candidate.strip().removeprefix("W/")
+            if tag in ("*", etag):
+                return True
+        return False
+
+    @staticmethod
+    def accepted_encodings(request: Request) -> list[str]:
+        encodings: list[str] = []
+        for item in request.headers.get("accept-encoding", "").split(","):
+            coding, _, params = item.strip().partition(";")
+            if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+                continue
+            if coding:
+                encodings.append(coding.strip().lower())
+        return encodings
+
+    def select_coding(self, request: Request, entry: CachedResponse) -> str:
+        accepted = self.accepted_encodings(request)
+        for coding in self.COMPRESSORS:
+            if coding in entry.bodies and coding in accepted:
+                return coding
+        return "identity"
+
+    def headers(self, etag: str) -> dict[str, str]:
+        return {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+    def not_modified(self, etag: str) -> Response:
+        return Response(status_code=304, headers=self.headers(etag))
+
+    def get(self, etag: str) -> CachedResponse | None:
+        entry = self._entries.get(etag, None)
+        if entry is not None:
+            self._entries.move_to_end(etag)
+        return entry
+
+    def store(self, etag: str, body: bytes, media_type: str | None) -> CachedResponse:
+        bodies: dict[str, bytes] = {"identity": body}
+        if len(body) >= self.MIN_COMPRESS_SIZE:
+            for coding, compress in self.COMPRESSORS.items():
+                compressed = compress(body)
+                if compressed is not None and len(compressed) < len(body):
+                    bodies[coding] = compressed
+        entry = CachedResponse(etag=etag, media_type=media_type, bodies=bodies)
+        if entry.size > self.max_bytes:
+            return entry
+        previous = self._entries.pop(etag, None)
+        if previous is not None:
+            self._size -= previous.size
+        self._entries[etag] = entry
+        self._size += entry.size
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+        return entry
+
+    def render(self, request: Request, entry: CachedResponse) -> Response:
+        coding = self.select_coding(request, entry)
+        etag = entry.coding_etag(coding)
+        if self.etag_matches(request, etag):
+            return self.not_modified(etag)
+        headers = self.headers(etag)
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(
+            content=entry.bodies[coding], media_type=entry.media_type, headers=headers
+        )
+
+    async def __call__(self, request: Request, call_next: Callable[..., Any]) -> Any:
+        if request.method != "GET" or request.url.path in self.exclude:
+            return await call_next(request)
+        params = self.declared_params(request)
+        if params is None:
+            return await call_next(request)
+
+        version = self.version()
+        etag = self.etag(request, params, version)
+        entry = self.get(etag)
+        if entry is not None:
+            return self.render(request, entry)
+
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        if self.version() != version:
+            # The state changed while the endpoint ran, so the body may not match
+            # the tag computed for the old state. Serve it uncached and untagged.
+            return Response(
+                content=body,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+            )
+        entry = self.store(etag, body, response.headers.get("content-type", None))
+        return self.render(request, entry)
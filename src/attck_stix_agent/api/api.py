@@ -1,17 +1,163 @@
-from fastapi import FastAPI
+import os
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Annotated
 
+from fastapi import FastAPI, HTTPException, Query
+
+from attck_stix_agent.api import (
+    HTTP_CACHE_ENV,
+    OBJECT_CACHE_SIZE_ENV,
+    REQUIRE_CHECKSUM_ENV,
+    STIX_CACHE_PATH_ENV,
+    STIX_SQLITE_ENV,
+    STIX_SRC_ENV,
+)
+from attck_stix_agent.api._http_cache import HttpCache
 from attck_stix_agent.attck import AttckStixManager
+from attck_stix_agent.attck.attck_coverage import CoverageEntry, CoverageReport
+from attck_stix_agent.attck.attck_graph import GraphResults
+from attck_stix_agent.attck.attck_hierarchy import TechniqueRollup
+from attck_stix_agent.attck.attck_timeline import MAX_TIME, MIN_TIME, CampaignInterval
 
-stix_manager: AttckStixManager = AttckStixManager()
+stix_manager: AttckStixManager = AttckStixManager(
+    stix_location=os.environ.get(STIX_SRC_ENV, None),
+    sqlite_path=os.environ.get(STIX_SQLITE_ENV, None),
+    object_cache_size=int(os.environ.get(OBJECT_CACHE_SIZE_ENV, "0")) or None,
+    cache_path=os.environ.get(STIX_CACHE_PATH_ENV, None),
+    require_checksum=os.environ.get(REQUIRE_CHECKSUM_ENV, "") not in ("", "0"),
+)
 api = FastAPI()
+http_cache = HttpCache(
+    version=lambda: stix_manager.state_version, exclude=("/group", "/debug/memory")
+)
+if os.environ.get(HTTP_CACHE_ENV, "1") != "0":
+    api.middleware("http")(http_cache)
+
+
+def _graph_results(results: GraphResults) -> list[dict]:
+    graph = stix_manager.graph
+    return [
+        {
+            "id": stix_id,
+            "type": graph.node_type(stix_id),
+            "name": graph.node_name(stix_id),
+            "relationships": [[edge.to_dict() for edge in path] for path in paths],
+        }
+        for stix_id, paths in results.items()
+    ]
+
+
+def _coverage_entries(entries: list[CoverageEntry]) -> list[dict]:
+    graph = stix_manager.graph
+    coverage: list[dict] = []
+    for entry in entries:
+        entry_dict: dict = {
+            "id": entry.id,
+            "name": graph.node_name(entry.id),
+            "count": len(entry.techniques),
+            "techniques": sorted(entry.techniques),
+        }
+        datasource_ref = (graph.get(entry.id) or {}).get("x_mitre_data_source_ref")
+        if datasource_ref:
+            entry_dict["datasource"] = {
+                "id": datasource_ref,
+                "name": graph.node_name(datasource_ref),
+            }
+        coverage.append(entry_dict)
+    return coverage
+
+
+def _coverage_report(groups: list[str], report: CoverageReport) -> dict:
+    return {
+        "groups": groups,
+        "techniques": len(report.techniques),
+        "mitigations": _coverage_entries(report.mitigations),
+        "datacomponents": _coverage_entries(report.datacomponents),
+        "unmitigated": sorted(report.unmitigated),
+        "undetected": sorted(report.undetected),
+    }
+
+
+def _groups_coverage(groups: list[str]) -> dict:
+    try:
+        group_ids = [stix_manager.resolve_group(group) for group in groups]
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    return _coverage_report(group_ids, stix_manager.group_coverage(group_ids))
+
+
+def _technique_rollups(
+    rollups: list[TechniqueRollup], kill_chain: str | None = None
+) -> list[dict]:
+    # Parents on ignored platforms are emitted as bare references.
+    graph = stix_manager.graph
+    processor = stix_manager.processor
+    return [
+        {
+            "technique": processor.technique_to_dict(
+                graph.get(rollup.id), kill_chain=kill_chain
+            )
+            if rollup.visible
+            else _node_refs([rollup.id])[0],
+            "visible": rollup.visible,
+            "used": rollup.used,
+            "count": rollup.count,
+            "subtechniques_used": len(rollup.subtechniques),
+            "subtechniques_total": rollup.total_subtechniques,
+            "subtechniques": [
+                processor.technique_to_dict(graph.get(sub_id), kill_chain=kill_chain)
+                for sub_id in rollup.subtechniques
+            ],
+        }
+        for rollup in rollups
+    ]
+
+
+def _node_refs(stix_ids: Iterable[str]) -> list[dict]:
+    graph = stix_manager.graph
+    return [
+        {
+            "id": stix_id,
+            "attck_id": graph.node_attck_id(stix_id),
+            "name": graph.node_name(stix_id),
+        }
+        for stix_id in sorted(stix_ids, key=graph.node_sort_key)
+    ]
+
+
+def _campaign_interval(campaign: CampaignInterval) -> dict:
+    graph = stix_manager.graph
+    return {
+        "id": campaign.id,
+        "attck_id": graph.node_attck_id(campaign.id),
+        "name": graph.node_name(campaign.id),
+        "first_seen": None if campaign.start == MIN_TIME else campaign.start,
+        "last_seen": None if campaign.end == MAX_TIME else campaign.end,
+    }
 
 
 @api.get("/group/{group}/techniques")
-def group_techniques(group: str, kill_chain: str | None = None) -> list[dict]:
-    stix_techniques = stix_manager.techniques_used_by_group(group)
+def group_techniques(
+    group: str,
+    kill_chain: str | None = None,
+    nested: bool = False,
+    transitive: bool = False,
+) -> list[dict]:
+    if nested:
+        rollups = stix_manager.group_techniques_rollup(group, transitive=transitive)
+        return _technique_rollups(rollups, kill_chain=kill_chain)
+    # Same technique IDs as the nested rollup, so counts always agree.
+    graph = stix_manager.graph
+    technique_ids = sorted(
+        stix_manager.group_technique_ids(group, transitive=transitive),
+        key=graph.node_sort_key,
+    )
     techniques: list[dict] = [
-        stix_manager.processor.technique_to_dict(technique, kill_chain=kill_chain)
-        for technique in stix_techniques
+        stix_manager.processor.technique_to_dict(
+            graph.get(technique_id), kill_chain=kill_chain
+        )
+        for technique_id in technique_ids
     ]
     return techniques
 
@@ -33,6 +179,22 @@ def group_software(group: str) -> dict[str, list[dict]]:
     }
 
 
+@api.get("/group/{group}/coverage")
+def group_coverage(group: str) -> dict:
+    return _groups_coverage([group])
+
+
+@api.get("/group/{group}/timeline")
+def group_timeline(group: str) -> list[dict]:
+    return [
+        {
+            **_campaign_interval(campaign),
+            "techniques": _node_refs(stix_manager.campaign_techniques(campaign.id)),
+        }
+        for campaign in stix_manager.group_timeline(group)
+    ]
+
+
 @api.get("/group/{group}")
 def get_group(group: str) -> dict:
     group_dict: dict = stix_manager.processor.group_to_dict(stix_manager.group(group))
@@ -67,3 +229,134 @@ def get_platform(name: str) -> dict[str, str | bool]:
 @api.patch("/platform/{name}")
 def update_platform(name: str, ignore: bool) -> None:
     stix_manager.update_platform(name, ignore=ignore)
+
+
+@api.get("/path/{source}")
+def path_query(
+    source: str,
+    hop: Annotated[list[str], Query()],
+    max_paths: int | None = None,
+) -> list[dict]:
+    try:
+        results = stix_manager.path_query(source, hop, max_paths=max_paths)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return _graph_results(results)
+
+
+@api.get("/closures")
+def all_closures() -> list[str]:
+    return stix_manager.graph.closures
+
+
+@api.get("/closure/{name}/{node}")
+def closure(name: str, node: str, reverse: bool = False) -> list[dict]:
+    try:
+        results = stix_manager.closure(name, node, reverse=reverse)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    return _graph_results(results)
+
+
+@api.get("/coverage")
+def groups_coverage(group: Annotated[list[str], Query()]) -> dict:
+    return _groups_coverage(group)
+
+
+@api.get("/tactics")
+def all_tactics(kill_chain: str | None = None) -> list[str]:
+    return stix_manager.tactics.phases(kill_chain=kill_chain)
+
+
+@api.get("/tactic/{tactic}/techniques")
+def tactic_techniques(tactic: str, kill_chain: str | None = None) -> list[dict]:
+    stix_techniques = stix_manager.techniques_in_tactic(tactic, kill_chain=kill_chain)
+    return [
+        stix_manager.processor.technique_to_dict(technique, kill_chain=kill_chain)
+        for technique in stix_techniques
+    ]
+
+
+@api.get("/group/{group}/tactic/{tactic}/techniques")
+def group_tactic_techniques(
+    group: str, tactic: str, kill_chain: str | None = None, transitive: bool = False
+) -> list[dict]:
+    stix_techniques = stix_manager.techniques_in_tactic(
+        tactic, kill_chain=kill_chain, group=group, transitive=transitive
+    )
+    return [
+        stix_manager.processor.technique_to_dict(technique, kill_chain=kill_chain)
+        for technique in stix_techniques
+    ]
+
+
+@api.get("/debug/memory")
+def debug_memory() -> dict:
+    memory: dict = {
+        "compaction": stix_manager.compaction_stats,
+        "types": stix_manager.memory_report(),
+    }
+    sqlite_store = stix_manager.sqlite_store
+    if sqlite_store is not None:
+        memory["object_cache"] = sqlite_store.source.cache_info()
+    return memory
+
+
+@api.get("/techniques")
+def query_techniques(q: str = "", kill_chain: str | None = None) -> list[dict]:
+    try:
+        stix_techniques = stix_manager.query_techniques(q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return [
+        stix_manager.processor.technique_to_dict(technique, kill_chain=kill_chain)
+        for technique in stix_techniques
+    ]
+
+
+@api.get("/techniques/plan")
+def explain_technique_query(q: str = "") -> list[dict]:
+    try:
+        return stix_manager.technique_query.explain(q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@api.get("/technique/{technique}/similar")
+def similar_techniques(
+    technique: str, k: Annotated[int, Query(ge=1, le=100)] = 10
+) -> list[dict]:
+    try:
+        neighbours = stix_manager.similar_techniques(technique, k=k)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    graph = stix_manager.graph
+    return [
+        {
+            "id": neighbour.id,
+            "attck_id": graph.node_attck_id(neighbour.id),
+            "name": graph.node_name(neighbour.id),
+            "score": neighbour.score,
+        }
+        for neighbour in neighbours
+    ]
+
+
+@api.get("/campaigns")
+def campaigns_between(
+    start: Annotated[datetime | None, Query(alias="from")] = None,
+    end: Annotated[datetime | None, Query(alias="to")] = None,
+) -> dict:
+    activity = stix_manager.campaign_activity(start, end)
+    timeline = stix_manager.timeline
+    return {
+        "campaigns": [
+            {
+                **_campaign_interval(campaign),
+                "groups": _node_refs(timeline.campaign_groups[campaign.id]),
+            }
+            for campaign in activity.campaigns
+        ],
+        "groups": _node_refs(activity.groups),
+        "techniques": _node_refs(activity.techniques),
+    }
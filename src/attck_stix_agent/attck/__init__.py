@@ -1,4 +1,23 @@
+from attck_stix_agent.attck.attck_coverage import AttckCoverageIndex
 from attck_stix_agent.attck.attck_domain import AttckDomain
+from attck_stix_agent.attck.attck_graph import AttckGraph, GraphEdge, GraphHop
+from attck_stix_agent.attck.attck_hierarchy import AttckTechniqueHierarchy
+from attck_stix_agent.attck.attck_query import AttckTechniqueQuery
+from attck_stix_agent.attck.attck_similarity import AttckTechniqueSimilarity
 from attck_stix_agent.attck.attck_stix import AttckStixManager
+from attck_stix_agent.attck.attck_tactics import AttckTacticIndex
+from attck_stix_agent.attck.attck_timeline import AttckCampaignTimeline
 
-__all__ = ["AttckDomain", "AttckStixManager"]
+__all__ = [
+    "AttckCampaignTimeline",
+    "AttckCoverageIndex",
+    "AttckDomain",
+    "AttckGraph",
+    "AttckStixManager",
+    "AttckTacticIndex",
+    "AttckTechniqueHierarchy",
+    "AttckTechniqueQuery",
+    "AttckTechniqueSimilarity",
+    "GraphEdge",
+    "GraphHop",
+]
@@ -0,0 +1,103 @@
+from collections.abc import Iterable, Mapping
+from typing import NamedTuple
+
+from attck_stix_agent.attck.attck_graph import AttckGraph
+
+
+class CoverageEntry(NamedTuple):
+    id: str
+    techniques: frozenset[str]
+
+
+class CoverageReport(NamedTuple):
+    techniques: frozenset[str]
+    mitigations: list[CoverageEntry]
+    datacomponents: list[CoverageEntry]
+
+    @property
+    def unmitigated(self) -> frozenset[str]:
+        covered: set[str] = set()
+        covered.update(*(entry.techniques for entry in self.mitigations))
+        return self.techniques.difference(covered)
+
+    @property
+    def undetected(self) -> frozenset[str]:
+        covered: set[str] = set()
+        covered.update(*(entry.techniques for entry in self.datacomponents))
+        return self.techniques.difference(covered)
+
+
+def _invert(index: Mapping[str, frozenset[str]]) -> dict[str, frozenset[str]]:
+    inverted: dict[str, set[str]] = {}
+    for key, values in index.items():
+        for value in values:
+            inverted.setdefault(value, set()).add(key)
+    return {key: frozenset(values) for key, values in inverted.items()}
+
+
+class AttckCoverageIndex:
+    """Defensive coverage indexes built from the relationship graph.
+
+    Maps techniques to the mitigations (`mitigates`) and data components
+    (`detects`) that cover them, along with the inverse mappings used to rank
+    coverage of a technique set.
+    """
+
+    def __init__(self, graph: AttckGraph) -> None:
+        self.technique_mitigations: dict[str, frozenset[str]] = {}
+        self.technique_datacomponents: dict[str, frozenset[str]] = {}
+        for technique_id in graph.ids_by_type("attack-pattern"):
+            mitigations = frozenset(
+                node_id
+                for node_id, _ in graph.neighbors(
+                    technique_id, "~mitigates:course-of-action"
+                )
+            )
+            if mitigations:
+                self.technique_mitigations[technique_id] = mitigations
+            datacomponents = frozenset(
+                node_id
+                for node_id, _ in graph.neighbors(
+                    technique_id, "~detects:x-mitre-data-component"
+                )
+            )
+            if datacomponents:
+                self.technique_datacomponents[technique_id] = datacomponents
+
+        self.mitigation_techniques: dict[str, frozenset[str]] = _invert(
+            self.technique_mitigations
+        )
+        self.datacomponent_techniques: dict[str, frozenset[str]] = _invert(
+            self.technique_datacomponents
+        )
+
+    @staticmethod
+    def _rank(
+        index: Mapping[str, frozenset[str]], techniques: frozenset[str]
+    ) -> list[CoverageEntry]:
+        entries: list[CoverageEntry] = []
+        for key, covered in index.items():
+            overlap = covered & techniques
+            if overlap:
+                entries.append(CoverageEntry(id=key, techniques=overlap))
+        entries.sort(key=lambda entry: (-len(entry.techniques), entry.id))
+        return entries
+
+    def report(self, techniques: Iterable[str]) -> CoverageReport:
+        """Rank mitigations and data components by how many techniques they cover.
+
+        Args:
+            techniques (Iterable[str]):
+                STIX IDs of the techniques to cover.
+
+        Returns:
+            CoverageReport:
+                Mitigations and data components covering at least one technique,
+                most covering first.
+        """
+        technique_set = frozenset(techniques)
+        return CoverageReport(
+            techniques=technique_set,
+            mitigations=self._rank(self.mitigation_techniques, technique_set),
+            datacomponents=self._rank(self.datacomponent_techniques, technique_set),
+        )
@@ -0,0 +1,347 @@
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any, ClassVar, NamedTuple
+
+from stix2.datastore import DataSource, DataStoreMixin
+
+GraphPath = tuple["GraphEdge", ...]
+GraphResults = dict[str, list[GraphPath]]
+
+
+class GraphEdge(NamedTuple):
+    id: str
+    source_ref: str
+    relationship_type: str
+    target_ref: str
+
+    def to_dict(self) -> dict[str, str]:
+        return self._asdict()
+
+
+class GraphHop(NamedTuple):
+    relationship_type: str
+    target_types: frozenset[str] = frozenset()
+    reverse: bool = False
+
+    @classmethod
+    def parse(cls, spec: str) -> "GraphHop":
+        """Parse a hop specification.
+
+        A hop is written as ``relationship_type[:target_type|target_type...]``.
+        Prefix the hop with ``~`` to follow the relationship from its target back
+        to its source, e.g. ``~uses:intrusion-set`` walks from a technique to the
+        groups that use it.
+
+        Args:
+            spec (str):
+                The hop specification.
+
+        Raises:
+            ValueError: `spec` does not name a relationship type.
+
+        Returns:
+            GraphHop: The parsed hop.
+        """
+        reverse = spec.startswith("~")
+        rel_type, _, target_types = spec.removeprefix("~").partition(":")
+        rel_type = rel_type.strip()
+        if not rel_type:
+            msg = f"invalid hop: '{spec}'"
+            raise ValueError(msg)
+        types = frozenset(t.strip() for t in target_types.split("|") if t.strip())
+        return cls(relationship_type=rel_type, target_types=types, reverse=reverse)
+
+    def __str__(self) -> str:
+        spec = f"~{self.relationship_type}" if self.reverse else self.relationship_type
+        if self.target_types:
+            spec = f"{spec}:{'|'.join(sorted(self.target_types))}"
+        return spec
+
+
+class GraphClosure(NamedTuple):
+    source_type: str
+    paths: tuple[tuple[str, ...], ...]
+
+
+def attck_id(stix_obj: Mapping) -> str:
+    """ATT&CK ID (e.g. `T1059.001`) of a STIX object, or an empty string."""
+    for external_ref in stix_obj.get("external_references", []):
+        if external_ref.get("source_name", "") in (
+            "mitre-attack",
+            "mitre-mobile-attack",
+            "mitre-ics-attack",
+        ):
+            return external_ref.get("external_id", "")
+    return ""
+
+
+def _is_active(stix_obj: Mapping) -> bool:
+    return not (stix_obj.get("revoked", False) or stix_obj.get("x_mitre_deprecated"))
+
+
+class AttckGraph:
+    """Typed, in-memory relationship graph over a loaded STIX bundle.
+
+    Nodes are the active (neither revoked nor deprecated) STIX domain objects and
+    edges are the active relationships between them. Frequently used multi-hop
+    paths are precomputed as closures when the graph is built.
+    """
+
+    DEFAULT_CLOSURES: ClassVar[dict[str, GraphClosure]] = {
+        "group-direct-technique": GraphClosure(
+            source_type="intrusion-set",
+            paths=(
+                ("uses:attack-pattern",),
+                ("~attributed-to:campaign", "uses:attack-pattern"),
+            ),
+        ),
+        "group-technique": GraphClosure(
+            source_type="intrusion-set",
+            paths=(
+                ("uses:attack-pattern",),
+                ("uses:malware|tool", "uses:attack-pattern"),
+                ("~attributed-to:campaign", "uses:attack-pattern"),
+                ("~attributed-to:campaign", "uses:malware|tool", "uses:attack-pattern"),
+            ),
+        ),
+        "group-software-technique": GraphClosure(
+            source_type="intrusion-set",
+            paths=(("uses:malware|tool", "uses:attack-pattern"),),
+        ),
+        "campaign-group": GraphClosure(
+            source_type="campaign",
+            paths=(("attributed-to:intrusion-set",),),
+        ),
+        "campaign-technique": GraphClosure(
+            source_type="campaign",
+            paths=(
+                ("uses:attack-pattern",),
+                ("uses:malware|tool", "uses:attack-pattern"),
+            ),
+        ),
+        "campaign-group-technique": GraphClosure(
+            source_type="campaign",
+            paths=(
+                ("attributed-to:intrusion-set", "uses:attack-pattern"),
+                (
+                    "attributed-to:intrusion-set",
+                    "uses:malware|tool",
+                    "uses:attack-pattern",
+                ),
+            ),
+        ),
+    }
+
+    def __init__(
+        self,
+        objects: Mapping[str, Any],
+        edges: Iterable[GraphEdge],
+        closures: Mapping[str, GraphClosure] | None = None,
+    ) -> None:
+        if closures is None:
+            closures = self.DEFAULT_CLOSURES
+
+        self._objects: Mapping[str, Any] = objects
+        self._types: dict[str, str] = {}
+        self._names: dict[str, str] = {}
+        self._attck_ids: dict[str, str] = {}
+        self._by_attck_id: dict[str, str] = {}
+        self._platforms: dict[str, frozenset[str]] = {}
+        self._by_type: dict[str, list[str]] = {}
+        for stix_id, stix_obj in objects.items():
+            stix_type: str = stix_obj.get("type", "")
+            self._types[stix_id] = stix_type
+            self._names[stix_id] = stix_obj.get("name", "")
+            self._attck_ids[stix_id] = attck_id(stix_obj)
+            if self._attck_ids[stix_id]:
+                self._by_attck_id.setdefault(self._attck_ids[stix_id], stix_id)
+            platforms = stix_obj.get("x_mitre_platforms", None)
+            if platforms:
+                self._platforms[stix_id] = frozenset(platforms)
+            self._by_type.setdefault(stix_type, []).append(stix_id)
+
+        self._out: dict[str, dict[str, list[GraphEdge]]] = {}
+        self._in: dict[str, dict[str, list[GraphEdge]]] = {}
+        for edge in edges:
+            if edge.source_ref not in self._types or edge.target_ref not in self._types:
+                continue
+            out_edges = self._out.setdefault(edge.source_ref, {})
+            out_edges.setdefault(edge.relationship_type, []).append(edge)
+            in_edges = self._in.setdefault(edge.target_ref, {})
+            in_edges.setdefault(edge.relationship_type, []).append(edge)
+
+        self._closures: dict[str, dict[str, GraphResults]] = {}
+        self._closures_reverse: dict[str, dict[str, set[str]]] = {}
+        for name, closure in closures.items():
+            self._build_closure(name, closure)
+
+    @classmethod
+    def from_store(
+        cls,
+        store: DataStoreMixin | DataSource,
+        closures: Mapping[str, GraphClosure] | None = None,
+    ) -> "AttckGraph":
+        objects: dict[str, Any] = {}
+        edges: list[GraphEdge] = []
+        for stix_obj in store.query():
+            if not _is_active(stix_obj):
+                continue
+            if stix_obj.get("type") == "relationship":
+                edges.append(
+                    GraphEdge(
+                        id=stix_obj["id"],
+                        source_ref=stix_obj["source_ref"],
+                        relationship_type=stix_obj["relationship_type"],
+                        target_ref=stix_obj["target_ref"],
+                    )
+                )
+            else:
+                objects[stix_obj["id"]] = stix_obj
+        return cls(objects=objects, edges=edges, closures=closures)
+
+    def __contains__(self, stix_id: object) -> bool:
+        return stix_id in self._types
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def get(self, stix_id: str) -> Any:
+        return self._objects.get(stix_id, None)
+
+    def node_type(self, stix_id: str) -> str:
+        return self._types.get(stix_id, "")
+
+    def node_name(self, stix_id: str) -> str:
+        return self._names.get(stix_id, "")
+
+    def node_attck_id(self, stix_id: str) -> str:
+        return self._attck_ids.get(stix_id, "")
+
+    def resolve(self, ref: str) -> str | None:
+        """STIX ID of the node referenced by a STIX ID or an ATT&CK ID."""
+        if ref in self._types:
+            return ref
+        return self._by_attck_id.get(ref.upper(), None)
+
+    def node_sort_key(self, stix_id: str) -> tuple[str, str]:
+        """Sort key ordering nodes by ATT&CK ID, then STIX ID."""
+        return (self.node_attck_id(stix_id), stix_id)
+
+    def node_platforms(self, stix_id: str) -> frozenset[str]:
+        return self._platforms.get(stix_id, frozenset())
+
+    def ids_by_type(self, stix_type: str) -> list[str]:
+        return self._by_type.get(stix_type, [])[:]
+
+    def edges(
+        self, stix_id: str, relationship_type: str, reverse: bool = False
+    ) -> list[GraphEdge]:
+        adjacency = self._in if reverse else self._out
+        return adjacency.get(stix_id, {}).get(relationship_type, [])
+
+    def neighbors(
+        self, stix_id: str, hop: GraphHop | str
+    ) -> Iterable[tuple[str, GraphEdge]]:
+        if isinstance(hop, str):
+            hop = GraphHop.parse(hop)
+        for edge in self.edges(stix_id, hop.relationship_type, reverse=hop.reverse):
+            neighbor = edge.source_ref if hop.reverse else edge.target_ref
+            if hop.target_types and self._types[neighbor] not in hop.target_types:
+                continue
+            yield neighbor, edge
+
+    def traverse(
+        self,
+        start: str,
+        hops: Sequence[GraphHop | str],
+        node_filter: Callable[[str], bool] | None = None,
+        max_paths: int | None = None,
+        max_total_paths: int | None = None,
+    ) -> GraphResults:
+        """Follow a sequence of hops from a starting node.
+
+        Args:
+            start (str):
+                STIX ID of the node to start from.
+            hops (Sequence[GraphHop | str]):
+                Hops to follow, in order. Strings are parsed with `GraphHop.parse`.
+            node_filter (Callable[[str], bool], optional):
+                Nodes reached along the way are dropped unless this returns True
+                for their STIX ID. Defaults to None.
+            max_paths (int, optional):
+                Keep at most this many justifying paths per reached node.
+                Defaults to None (keep all).
+            max_total_paths (int, optional):
+                Keep at most this many justifying paths after each hop, across all
+                reached nodes. Nodes past the limit are not reached. Defaults to
+                None (keep all).
+
+        Returns:
+            GraphResults:
+                Mapping of reached STIX IDs to the relationship paths that justify
+                them.
+        """
+        parsed: list[GraphHop] = [
+            GraphHop.parse(hop) if isinstance(hop, str) else hop for hop in hops
+        ]
+        frontier: GraphResults = {start: [()]} if start in self else {}
+        for hop in parsed:
+            next_frontier: GraphResults = {}
+            total_paths = 0
+            for node_id, paths in frontier.items():
+                for neighbor, edge in self.neighbors(node_id, hop):
+                    if max_total_paths is not None and total_paths >= max_total_paths:
+                        break
+                    if node_filter is not None and not node_filter(neighbor):
+                        continue
+                    neighbor_paths = next_frontier.setdefault(neighbor, [])
+                    for path in paths:
+                        if max_paths is not None and len(neighbor_paths) >= max_paths:
+                            break
+                        if (
+                            max_total_paths is not None
+                            and total_paths >= max_total_paths
+                        ):
+                            break
+                        neighbor_paths.append((*path, edge))
+                        total_paths += 1
+            frontier = next_frontier
+        return frontier
+
+    def _build_closure(self, name: str, closure: GraphClosure) -> None:
+        forward: dict[str, GraphResults] = {}
+        reverse: dict[str, set[str]] = {}
+        for source_id in self._by_type.get(closure.source_type, []):
+            results: GraphResults = {}
+            for path in closure.paths:
+                for target_id, paths in self.traverse(source_id, path).items():
+                    results.setdefault(target_id, []).extend(paths)
+            if not results:
+                continue
+            forward[source_id] = results
+            for target_id in results:
+                reverse.setdefault(target_id, set()).add(source_id)
+        self._closures[name] = forward
+        self._closures_reverse[name] = reverse
+
+    @property
+    def closures(self) -> list[str]:
+        return sorted(self._closures)
+
+    def _check_closure(self, name: str) -> None:
+        if name not in self._closures:
+            msg = f"invalid closure: {name}"
+            raise ValueError(msg)
+
+    def closure(self, name: str, source: str) -> GraphResults:
+        """Targets reachable from `source` along a precomputed closure."""
+        self._check_closure(name)
+        return self._closures[name].get(source, {})
+
+    def closure_sources(self, name: str, target: str) -> GraphResults:
+        """Sources that reach `target` along a precomputed closure."""
+        self._check_closure(name)
+        forward = self._closures[name]
+        return {
+            source_id: forward[source_id][target]
+            for source_id in sorted(self._closures_reverse[name].get(target, ()))
+        }
@@ -0,0 +1,84 @@
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+from attck_stix_agent.attck.attck_graph import AttckGraph
+
+
+class TechniqueRollup(NamedTuple):
+    id: str
+    used: bool
+    subtechniques: tuple[str, ...]
+    total_subtechniques: int
+    visible: bool = True
+
+    @property
+    def count(self) -> int:
+        return len(self.subtechniques) + int(self.used)
+
+
+class AttckTechniqueHierarchy:
+    """Parent technique to sub-technique index built from `subtechnique-of`."""
+
+    def __init__(self, graph: AttckGraph) -> None:
+        children: dict[str, list[str]] = {}
+        self.parents: dict[str, str] = {}
+        for technique_id in graph.ids_by_type("attack-pattern"):
+            for parent_id, _ in graph.neighbors(
+                technique_id, "subtechnique-of:attack-pattern"
+            ):
+                self.parents[technique_id] = parent_id
+                children.setdefault(parent_id, []).append(technique_id)
+        self.children: dict[str, tuple[str, ...]] = {
+            parent_id: tuple(sorted(child_ids, key=graph.node_sort_key))
+            for parent_id, child_ids in children.items()
+        }
+        self._sort_key = graph.node_sort_key
+
+    def parent(self, technique_id: str) -> str | None:
+        return self.parents.get(technique_id, None)
+
+    def subtechniques(self, technique_id: str) -> tuple[str, ...]:
+        return self.children.get(technique_id, ())
+
+    def rollup(
+        self,
+        technique_ids: Iterable[str],
+        node_filter: Callable[[str], bool] | None = None,
+    ) -> list[TechniqueRollup]:
+        """Group techniques under their parent techniques.
+
+        Args:
+            technique_ids (Iterable[str]):
+                STIX IDs of techniques and sub-techniques.
+            node_filter (Callable[[str], bool], optional):
+                Parents for which this returns False are marked not `visible`.
+                Their entries are kept so that their visible sub-techniques stay
+                grouped. Defaults to None.
+
+        Returns:
+            list[TechniqueRollup]:
+                One entry per parent technique, in ATT&CK ID order. A parent is
+                included when it or any of its sub-techniques is in
+                `technique_ids`; `used` tells whether the parent itself is.
+        """
+        used: set[str] = set()
+        subtechniques: dict[str, list[str]] = {}
+        for technique_id in technique_ids:
+            parent_id = self.parents.get(technique_id, None)
+            if parent_id is None:
+                used.add(technique_id)
+                subtechniques.setdefault(technique_id, [])
+            else:
+                subtechniques.setdefault(parent_id, []).append(technique_id)
+        return [
+            TechniqueRollup(
+                id=parent_id,
+                used=parent_id in used,
+                subtechniques=tuple(
+                    sorted(subtechniques[parent_id], key=self._sort_key)
+                ),
+                total_subtechniques=len(self.children.get(parent_id, ())),
+                visible=node_filter is None or node_filter(parent_id),
+            )
+            for parent_id in sorted(subtechniques, key=self._sort_key)
+        ]
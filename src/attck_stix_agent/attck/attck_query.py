@@ -0,0 +1,198 @@
+import shlex
+from collections.abc import Iterable
+from typing import Any, ClassVar, NamedTuple
+
+from attck_stix_agent.attck.attck_graph import AttckGraph
+from attck_stix_agent.attck.attck_tactics import AttckTacticIndex
+
+
+class QueryTerm(NamedTuple):
+    field: str
+    values: tuple[str, ...]
+    negate: bool = False
+
+    def __str__(self) -> str:
+        prefix = "-" if self.negate else ""
+        return f"{prefix}{self.field}:{','.join(self.values)}"
+
+
+class QueryPlanStep(NamedTuple):
+    term: QueryTerm
+    bitmap: int
+
+    @property
+    def size(self) -> int:
+        return self.bitmap.bit_count()
+
+
+class AttckTechniqueQuery:
+    """Technique filter language compiled to bitmap intersections.
+
+    A query is a whitespace-separated list of `field:value[,value...]` terms,
+    all of which must match. Comma-separated values match any of the values, and
+    a `-` prefix excludes matching techniques. Values containing spaces can be
+    quoted, e.g. ``platform:Windows tactic:credential-access
+    "datasource:Process: Process Creation" subtechnique:false``.
+
+    Every term resolves to a precomputed bitmap over all techniques. The planner
+    intersects the included terms from the most to the least selective, stopping
+    as soon as the result is empty, and then removes the excluded terms.
+    """
+
+    FIELDS: ClassVar[tuple[str, ...]] = (
+        "platform",
+        "tactic",
+        "datasource",
+        "subtechnique",
+        "group",
+        "group-transitive",
+    )
+    TRUE_VALUES: ClassVar[frozenset[str]] = frozenset({"true", "yes", "1"})
+    FALSE_VALUES: ClassVar[frozenset[str]] = frozenset({"false", "no", "0"})
+
+    def __init__(self, graph: AttckGraph, tactics: AttckTacticIndex) -> None:
+        self.technique_ids: list[str] = sorted(
+            graph.ids_by_type("attack-pattern"), key=graph.node_sort_key
+        )
+        techniques = [graph.get(stix_id) for stix_id in self.technique_ids]
+        self._bits: dict[str, int] = {
+            stix_id: 1 << idx for idx, stix_id in enumerate(self.technique_ids)
+        }
+        self.all: int = (1 << len(self.technique_ids)) - 1
+
+        self._postings: dict[str, dict[str, int]] = {field: {} for field in self.FIELDS}
+        for technique in techniques:
+            bit = self._bits[technique["id"]]
+            for platform in technique.get("x_mitre_platforms", []):
+                self._add("platform", platform, bit)
+            for datasource in technique.get("x_mitre_data_sources", []):
+                self._add("datasource", datasource, bit)
+                source_name, _, component = datasource.partition(":")
+                if component:
+                    self._add("datasource", source_name, bit)
+            is_subtechnique = technique.get("x_mitre_is_subtechnique", False)
+            self._add("subtechnique", str(bool(is_subtechnique)), bit)
+        for phases in tactics.phase_techniques.values():
+            for phase, technique_ids in phases.items():
+                self._add("tactic", phase, self.bitmap(technique_ids))
+
+        self._group_keys: dict[str, str] = {}
+        for group_id in graph.ids_by_type("intrusion-set"):
+            group = graph.get(group_id)
+            for key in (group_id, graph.node_attck_id(group_id), group.get("name", "")):
+                if key:
+                    self._group_keys[key.lower()] = group_id
+            direct = graph.closure("group-direct-technique", group_id)
+            self._postings["group"][group_id] = self.bitmap(direct)
+            transitive = graph.closure("group-technique", group_id)
+            self._postings["group-transitive"][group_id] = self.bitmap(transitive)
+
+    def _add(self, field: str, value: str, bitmap: int) -> None:
+        key = value.strip().lower()
+        self._postings[field][key] = self._postings[field].get(key, 0) | bitmap
+
+    def bitmap(self, technique_ids: Iterable[str]) -> int:
+        bitmap = 0
+        for technique_id in technique_ids:
+            bitmap |= self._bits.get(technique_id, 0)
+        return bitmap
+
+    def decode(self, bitmap: int) -> list[str]:
+        technique_ids: list[str] = []
+        while bitmap:
+            low_bit = bitmap & -bitmap
+            technique_ids.append(self.technique_ids[low_bit.bit_length() - 1])
+            bitmap ^= low_bit
+        return technique_ids
+
+    def values(self, field: str) -> list[str]:
+        return sorted(self._postings.get(field, {}))
+
+    @classmethod
+    def parse(cls, query: str) -> list[QueryTerm]:
+        """Parse a query string into terms.
+
+        Raises:
+            ValueError: The query is malformed or uses an unknown field.
+
+        Returns:
+            list[QueryTerm]: The parsed terms, in query order.
+        """
+        try:
+            tokens = shlex.split(query)
+        except ValueError as e:
+            msg = f"invalid query: {e}"
+            raise ValueError(msg) from e
+
+        terms: list[QueryTerm] = []
+        for token in tokens:
+            negate = token.startswith(("-", "!"))
+            field, sep, value = token.lstrip("-!").partition(":")
+            field = field.strip().lower()
+            if not sep or field not in cls.FIELDS:
+                msg = f"invalid query term: '{token}'"
+                raise ValueError(msg)
+            values = tuple(v.strip() for v in value.split(",") if v.strip())
+            if not values:
+                msg = f"query term has no value: '{token}'"
+                raise ValueError(msg)
+            terms.append(QueryTerm(field=field, values=values, negate=negate))
+        return terms
+
+    def _resolve_value(self, field: str, value: str) -> str:
+        key = value.lower()
+        if field == "subtechnique":
+            if key in self.TRUE_VALUES:
+                return str(True).lower()
+            if key in self.FALSE_VALUES:
+                return str(False).lower()
+            msg = f"invalid subtechnique value: '{value}'"
+            raise ValueError(msg)
+        if field in ("group", "group-transitive"):
+            return self._group_keys.get(key, key)
+        return key
+
+    def term_bitmap(self, term: QueryTerm) -> int:
+        postings = self._postings[term.field]
+        bitmap = 0
+        for value in term.values:
+            bitmap |= postings.get(self._resolve_value(term.field, value), 0)
+        return bitmap
+
+    def plan(self, terms: Iterable[QueryTerm]) -> list[QueryPlanStep]:
+        """Order terms for evaluation.
+
+        Included terms come first, most selective first, followed by excluded
+        terms, least selective (i.e. removing the most techniques) first.
+        """
+        steps = [QueryPlanStep(term, self.term_bitmap(term)) for term in terms]
+        included = sorted((s for s in steps if not s.term.negate), key=lambda s: s.size)
+        excluded = sorted((s for s in steps if s.term.negate), key=lambda s: -s.size)
+        return included + excluded
+
+    def execute(self, terms: Iterable[QueryTerm], universe: int | None = None) -> int:
+        bitmap = self.all if universe is None else universe
+        for step in self.plan(terms):
+            if not bitmap:
+                break
+            if step.term.negate:
+                bitmap &= ~step.bitmap
+            else:
+                bitmap &= step.bitmap
+        return bitmap
+
+    def __call__(self, query: str, ignored_platforms: Iterable[str] = ()) -> list[str]:
+        """STIX IDs of the techniques matching `query`, in ATT&CK ID order.
+
+        Techniques on any of `ignored_platforms` are never matched.
+        """
+        universe = self.all
+        for platform in ignored_platforms:
+            universe &= ~self._postings["platform"].get(platform.lower(), 0)
+        return self.decode(self.execute(self.parse(query), universe=universe))
+
+    def explain(self, query: str) -> list[dict[str, Any]]:
+        return [
+            {"term": str(step.term), "matches": step.size}
+            for step in self.plan(self.parse(query))
+        ]
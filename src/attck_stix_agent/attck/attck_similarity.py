@@ -0,0 +1,134 @@
+import re
+from collections import Counter
+from collections.abc import Iterable
+from typing import ClassVar, NamedTuple
+
+import numpy as np
+
+from attck_stix_agent.attck.attck_graph import AttckGraph
+from attck_stix_agent.util._citation import remove_citation
+
+_STOP_WORDS = (
+    "a about above after again also an and any are as at be been before "
+    "being between both but by can could do does during each for from "
+    "further had has have having how if in into is it its may more most "
+    "must no not of on once only or other such than that the their them "
+    "then there these they this those through to under until up use used "
+    "uses using via was were what when where which while who will with "
+    "within would"
+)
+
+
+class SimilarTechnique(NamedTuple):
+    id: str
+    score: float
+
+
+class AttckTechniqueSimilarity:
+    """TF-IDF similarity between techniques.
+
+    Each technique and sub-technique is described by its name, its description
+    with citations removed, and its data sources. Documents are weighted with
+    sublinear TF and smoothed IDF and L2-normalized, so cosine similarity is a
+    dot product. The document-by-term matrix `M` is only needed while loading:
+    the similarities of all pairs of techniques are computed as a single matrix
+    product `M @ M.T` and kept, so a lookup only ranks one row.
+    """
+
+    TOKEN_PATTERN: ClassVar[re.Pattern] = re.compile(r"[a-z0-9][a-z0-9\-]+")
+    STOP_WORDS: ClassVar[frozenset[str]] = frozenset(_STOP_WORDS.split())
+    NAME_WEIGHT: ClassVar[int] = 2
+
+    def __init__(self, graph: AttckGraph) -> None:
+        self.technique_ids: list[str] = sorted(
+            graph.ids_by_type("attack-pattern"), key=graph.node_sort_key
+        )
+        self._doc_index: dict[str, int] = {
+            technique_id: idx for idx, technique_id in enumerate(self.technique_ids)
+        }
+        self._similarity: np.ndarray = self._similarity_matrix(
+            self._tfidf_matrix(
+                [
+                    Counter(self._technique_tokens(graph.get(technique_id)))
+                    for technique_id in self.technique_ids
+                ]
+            )
+        )
+
+    @staticmethod
+    def _tfidf_matrix(term_counts: list[Counter[str]]) -> np.ndarray:
+        vocabulary: dict[str, int] = {}
+        rows: list[int] = []
+        cols: list[int] = []
+        counts: list[int] = []
+        for doc_idx, doc_counts in enumerate(term_counts):
+            for term, tf in doc_counts.items():
+                rows.append(doc_idx)
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(tf)
+
+        matrix = np.zeros((len(term_counts), len(vocabulary)), dtype=np.float32)
+        matrix[rows, cols] = 1 + np.log(np.asarray(counts, dtype=np.float32))
+        doc_freq = np.count_nonzero(matrix, axis=0)
+        matrix *= np.log((1 + len(term_counts)) / (1 + doc_freq)) + 1
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1)
+        return matrix
+
+    @staticmethod
+    def _similarity_matrix(matrix: np.ndarray) -> np.ndarray:
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0)
+        return similarity
+
+    @classmethod
+    def tokenize(cls, text: str) -> list[str]:
+        return [
+            token
+            for token in cls.TOKEN_PATTERN.findall(text.lower())
+            if token not in cls.STOP_WORDS
+        ]
+
+    @classmethod
+    def _technique_tokens(cls, technique) -> Iterable[str]:
+        name_tokens = cls.tokenize(technique.get("name", ""))
+        tokens = name_tokens * cls.NAME_WEIGHT
+        tokens.extend(cls.tokenize(remove_citation(technique.get("description", ""))))
+        for datasource in technique.get("x_mitre_data_sources", []):
+            tokens.extend(cls.tokenize(datasource))
+        return tokens
+
+    def similar(
+        self, technique_id: str, k: int = 10, exclude: Iterable[str] = ()
+    ) -> list[SimilarTechnique]:
+        """Techniques most similar to `technique_id`, by cosine similarity.
+
+        Args:
+            technique_id (str):
+                STIX ID of the technique.
+            k (int, optional):
+                Number of neighbours to return. Defaults to 10.
+            exclude (Iterable[str], optional):
+                STIX IDs that must not be returned. Defaults to ().
+
+        Raises:
+            KeyError: `technique_id` is not a known technique.
+
+        Returns:
+            list[SimilarTechnique]: Up to `k` neighbours, most similar first.
+        """
+        if technique_id not in self._doc_index:
+            raise KeyError(technique_id)
+        scores = self._similarity[self._doc_index[technique_id]]
+        candidates = np.flatnonzero(scores > 0)
+        excluded = [self._doc_index[t] for t in exclude if t in self._doc_index]
+        if excluded:
+            candidates = candidates[~np.isin(candidates, excluded)]
+        # Rank on the reported (rounded) scores with a stable sort, so ties keep
+        # ATT&CK ID order.
+        rounded = np.round(scores[candidates].astype(np.float64), 6)
+        order = np.argsort(-rounded, kind="stable")[:k]
+        return [
+            SimilarTechnique(self.technique_ids[candidates[idx]], float(rounded[idx]))
+            for idx in order
+        ]
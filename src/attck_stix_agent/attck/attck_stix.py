@@ -1,5 +1,9 @@
+import hashlib
 import random
-from collections.abc import Generator, Iterable
+from collections.abc import Callable, Generator, Iterable
+from datetime import datetime
+from functools import partial
+from os import PathLike
 from typing import ClassVar, Literal
 
 from mitreattack.stix20 import MitreAttackData
@@ -7,9 +11,34 @@ from stix2.datastore.memory import MemoryStore
 from stix2.v20.sdo import AttackPattern, IntrusionSet, Malware, Tool
 from stix2.v20.sro import Relationship
 
+from attck_stix_agent._compact import StixCompactor, memory_report
 from attck_stix_agent._serialize import StixProcessor
+from attck_stix_agent._sqlite import SQLiteObjects, SQLiteStore
 from attck_stix_agent._stix import StixImporter
+from attck_stix_agent.attck.attck_coverage import AttckCoverageIndex, CoverageReport
+from attck_stix_agent.attck.attck_graph import (
+    AttckGraph,
+    GraphEdge,
+    GraphHop,
+    GraphResults,
+)
+from attck_stix_agent.attck.attck_hierarchy import (
+    AttckTechniqueHierarchy,
+    TechniqueRollup,
+)
+from attck_stix_agent.attck.attck_query import AttckTechniqueQuery
+from attck_stix_agent.attck.attck_similarity import (
+    AttckTechniqueSimilarity,
+    SimilarTechnique,
+)
+from attck_stix_agent.attck.attck_tactics import AttckTacticIndex
+from attck_stix_agent.attck.attck_timeline import (
+    AttckCampaignTimeline,
+    CampaignActivity,
+    CampaignInterval,
+)
 from attck_stix_agent.exceptions import StixTypeMismatchError
+from attck_stix_agent.util import LazyValue, to_path, warm_lazy_values
 
 
 class AttckStixManager:
@@ -18,44 +47,207 @@ class AttckStixManager:
     DEFAULT_STIX_SRC: ClassVar[str] = (
         "https://github.com/mitre/cti/raw/refs/heads/master/enterprise-attack/enterprise-attack.json"
     )
+    MAX_PATH_HOPS: ClassVar[int] = 4
+    DEFAULT_MAX_PATHS: ClassVar[int] = 10
+    MAX_PATHS: ClassVar[int] = 100
+    MAX_TOTAL_PATHS: ClassVar[int] = 10_000
 
     def __init__(
-        self, stix_location: str | None = None, stix_version: str | None = None
+        self,
+        stix_location: str | None = None,
+        stix_version: str | None = None,
+        compact: bool = True,
+        sqlite_path: str | PathLike | None = None,
+        object_cache_size: int | None = None,
+        cache_path: str | PathLike | None = None,
+        require_checksum: bool = False,
     ) -> None:
+        """Load ATT&CK STIX content and build the indexes over it.
+
+        Args:
+            stix_location (str, optional):
+                STIX source, see `StixImporter`. Defaults to None
+                (`DEFAULT_STIX_SRC`).
+            stix_version (str, optional):
+                STIX version of the content. Defaults to None
+                (`DEFAULT_STIX_VERSION`).
+            compact (bool, optional):
+                Compact the objects held in memory, see `StixCompactor`. Has no
+                effect with `sqlite_path`. Defaults to True.
+            sqlite_path (str | PathLike, optional):
+                Keep the objects in a SQLite database at this location instead of
+                in memory, see `SQLiteStore`. An existing database imported from
+                `stix_location` is reused. Defaults to None.
+            object_cache_size (int, optional):
+                Maximum number of objects kept in memory with `sqlite_path`.
+                Defaults to None (`SQLiteSource.DEFAULT_CACHE_SIZE`).
+            cache_path (str | PathLike, optional):
+                Directory imported content is snapshotted to, and `snapshot://`
+                sources are read from, see `StixImporter`. Defaults to None.
+            require_checksum (bool, optional):
+                Refuse local sources without a checksum to verify them against.
+                Defaults to False.
+        """
         if stix_version is None:
             stix_version = self.DEFAULT_STIX_VERSION
         if stix_location is None:
             stix_location = self.DEFAULT_STIX_SRC
 
         self.stix_version: str = stix_version
+        self.compact: bool = compact
+        self.compaction_stats: dict[str, int] = {}
+        self.sqlite_path: str | PathLike | None = sqlite_path
+        self.object_cache_size: int | None = object_cache_size
+        self.cache_path: str | PathLike | None = cache_path
+        self.require_checksum: bool = require_checksum
         self.attck_data: MitreAttackData = self._load_stix(
             stix_location, version=self.stix_version
         )
+        self.dataset_version: str = self._dataset_version(self.attck_data)
+        self.graph: AttckGraph = self._build_graph(self.attck_data)
+        self.coverage: AttckCoverageIndex = AttckCoverageIndex(self.graph)
+        self.tactics: AttckTacticIndex = AttckTacticIndex(self.graph)
+        self.technique_query: AttckTechniqueQuery = AttckTechniqueQuery(
+            self.graph, self.tactics
+        )
+        self.hierarchy: AttckTechniqueHierarchy = AttckTechniqueHierarchy(self.graph)
+        self.similarity: AttckTechniqueSimilarity = AttckTechniqueSimilarity(self.graph)
+        self.timeline: AttckCampaignTimeline = AttckCampaignTimeline(self.graph)
         self.processor: StixProcessor = StixProcessor()
-        self._all_campaigns: list = []
-        self._all_datacomponents: list = []
-        self._all_datasources: list = []
-        self._all_groups: list[IntrusionSet] = []
-        self._all_matrices: list = []
-        self._all_mitigations: list = []
-        self._all_software: list = []
-        self._all_subtechniques: list[AttackPattern] = []
-        self._all_techniques: list[AttackPattern] = []
-        self._all_tactics: list = []
-        self._all_platforms: list[str] = []
+        self.processor.technique_phases = self.tactics.technique_phases
+        self._all_campaigns: LazyValue[list] = self._lazy_query(
+            self.attck_data.get_campaigns
+        )
+        self._all_datacomponents: LazyValue[list] = self._lazy_query(
+            self.attck_data.get_datacomponents
+        )
+        self._all_datasources: LazyValue[list] = self._lazy_query(
+            self.attck_data.get_datasources
+        )
+        self._all_groups: LazyValue[list[IntrusionSet]] = self._lazy_query(
+            self.attck_data.get_groups
+        )
+        self._all_matrices: LazyValue[list] = self._lazy_query(
+            self.attck_data.get_matrices
+        )
+        self._all_mitigations: LazyValue[list] = self._lazy_query(
+            self.attck_data.get_mitigations
+        )
+        self._all_software: LazyValue[list] = self._lazy_query(
+            self.attck_data.get_software
+        )
+        self._all_tools: LazyValue[list[Tool]] = self._lazy_query(
+            partial(self.attck_data.get_objects_by_type, "tool")
+        )
+        self._all_malware: LazyValue[list[Malware]] = self._lazy_query(
+            partial(self.attck_data.get_objects_by_type, "malware")
+        )
+        self._all_subtechniques: LazyValue[list[AttackPattern]] = self._lazy_query(
+            self.attck_data.get_subtechniques
+        )
+        self._all_techniques: LazyValue[list[AttackPattern]] = self._lazy_query(
+            self.attck_data.get_techniques
+        )
+        self._all_tactics: LazyValue[list] = self._lazy_query(
+            self.attck_data.get_tactics
+        )
+        self._all_platforms: LazyValue[list[str]] = LazyValue(self._collect_platforms)
         self._ignored_platforms: list[str] = []
 
+    def _lazy_query(self, query: Callable[..., list]) -> LazyValue:
+        # Object lists are not kept when objects live in SQLite, as they would
+        # hold most of the bundle in memory.
+        return LazyValue(
+            partial(query, remove_revoked_deprecated=True),
+            retain=self.sqlite_path is None,
+        )
+
+    @property
+    def _lazy_values(self) -> list[LazyValue]:
+        return [value for value in vars(self).values() if isinstance(value, LazyValue)]
+
+    def warm_caches(self, max_workers: int | None = None) -> None:
+        """Populate the lazily loaded object lists ahead of the first request."""
+        warm_lazy_values(self._lazy_values, max_workers=max_workers)
+
+    def _importer(self, stix_version: str) -> StixImporter:
+        importer = StixImporter(
+            stix_version=stix_version,
+            allow_custom=True,
+            require_checksum=self.require_checksum,
+        )
+        importer.cache_path = self.cache_path
+        return importer
+
     def _load_memory_store(self, path: str, stix_version: str) -> MemoryStore:
-        importer = StixImporter(stix_version=stix_version, allow_custom=True)
+        importer = self._importer(stix_version)
         # Raises StixImportError on failure
         memory_store: MemoryStore = importer(path)
         return memory_store
 
+    def _load_sqlite_store(self, location: str, stix_version: str) -> SQLiteStore:
+        if self.sqlite_path is None:
+            raise ValueError
+        db_path = to_path(self.sqlite_path)
+        importer = self._importer(stix_version)
+        checksum = importer.source_checksum(location)
+        # Reuse the database only while the source content is known to be unchanged.
+        if db_path.is_file() and checksum is not None:
+            sqlite_store = SQLiteStore(
+                db_path, stix_version=stix_version, cache_size=self.object_cache_size
+            )
+            if sqlite_store.metadata == {
+                "source": location,
+                "stix_version": stix_version,
+                "checksum": checksum,
+            }:
+                return sqlite_store
+            sqlite_store.source.close()
+        # Raises StixImportError on failure
+        return importer.to_sqlite(
+            location, db_path, cache_size=self.object_cache_size, checksum=checksum
+        )
+
     def _load_stix(self, location: str, version: str) -> MitreAttackData:
+        if self.sqlite_path is not None:
+            sqlite_store = self._load_sqlite_store(location, stix_version=version)
+            return MitreAttackData(src=sqlite_store)  # pyright: ignore [reportArgumentType]
         memory_store = self._load_memory_store(location, stix_version=version)
+        if self.compact:
+            self.compaction_stats = StixCompactor()(memory_store.query())
         attck_data = MitreAttackData(src=memory_store)  # pyright: ignore [reportArgumentType]
         return attck_data
 
+    @property
+    def sqlite_store(self) -> SQLiteStore | None:
+        src = self.attck_data.src
+        return src if isinstance(src, SQLiteStore) else None
+
+    def _dataset_version(self, attck_data: MitreAttackData) -> str:
+        digest = hashlib.sha256()
+        if isinstance(attck_data.src, SQLiteStore):
+            for stix_id, modified in attck_data.src.source.object_versions():
+                digest.update(f"{stix_id}|{modified}\n".encode())
+            return digest.hexdigest()
+        stix_objs = sorted(attck_data.src.query(), key=lambda obj: obj.get("id", ""))
+        for stix_obj in stix_objs:
+            modified = stix_obj.get("modified", "")
+            digest.update(f"{stix_obj.get('id', '')}|{modified}\n".encode())
+        return digest.hexdigest()
+
+    @property
+    def state_version(self) -> str:
+        """Token that changes whenever responses derived from the data may change."""
+        ignored_platforms = ",".join(sorted(self._ignored_platforms))
+        return f"{self.dataset_version}:{ignored_platforms}"
+
+    def _build_graph(self, attck_data: MitreAttackData) -> AttckGraph:
+        src = attck_data.src
+        if isinstance(src, SQLiteStore):
+            edges = (GraphEdge(*row) for row in src.source.relationship_rows())
+            return AttckGraph(objects=src.objects, edges=edges)
+        return AttckGraph.from_store(src)
+
     @property
     def ignored_platforms(self) -> list[str]:
         return self._ignored_platforms[:]
@@ -70,13 +262,13 @@ class AttckStixManager:
             self._ignored_platforms = ignored_platforms
             raise
 
-    def _update_platform_cache(self) -> None:
+    def _collect_platforms(self) -> list[str]:
         platforms = set()
-        for technique in self.get_techniques():
+        for technique in self._all_techniques.get():
             _platforms = technique.get("x_mitre_platforms", None)
             if _platforms is not None:
                 platforms.update(_platforms)
-        self._all_platforms = sorted(platforms)
+        return sorted(platforms)
 
     def _platform_update_ignored(self, platform: str, ignore: bool) -> None:
         try:
@@ -89,48 +281,26 @@ class AttckStixManager:
             _ = self._ignored_platforms.pop(ignored_idx)
 
     def update_platform(self, platform: str, ignore: bool | None = None) -> None:
-        if not self._all_platforms:
-            self._update_platform_cache()
-        if platform not in self._all_platforms:
+        if platform not in self.get_platforms():
             msg = f"invalid platform: {platform}"
             raise ValueError(msg)
         if ignore is not None:
             self._platform_update_ignored(platform, ignore=ignore)
 
     def get_campaigns(self) -> list:
-        if not self._all_campaigns:
-            self._all_campaigns = self.attck_data.get_campaigns(
-                remove_revoked_deprecated=True
-            )
-        return self._all_campaigns
+        return self._all_campaigns.get()
 
     def get_datacomponents(self) -> list:
-        if not self._all_datacomponents:
-            self._all_datacomponents = self.attck_data.get_datacomponents(
-                remove_revoked_deprecated=True
-            )
-        return self._all_datacomponents
+        return self._all_datacomponents.get()
 
     def get_datasources(self) -> list:
-        if not self._all_datasources:
-            self._all_datasources = self.attck_data.get_datasources(
-                remove_revoked_deprecated=True
-            )
-        return self._all_datasources
+        return self._all_datasources.get()
 
     def get_groups(self) -> list[IntrusionSet]:
-        if not self._all_groups:
-            self._all_groups = self.attck_data.get_groups(
-                remove_revoked_deprecated=True
-            )
-        return self._all_groups
+        return self._all_groups.get()
 
     def random_group(self) -> IntrusionSet:
-        if not self._all_groups:
-            self._all_groups = self.attck_data.get_groups(
-                remove_revoked_deprecated=True
-            )
-        group = random.choice(self._all_groups)  # noqa: S311
+        group = random.choice(self._all_groups.get())  # noqa: S311
         if not isinstance(group, IntrusionSet):
             raise StixTypeMismatchError
         return group
@@ -145,37 +315,19 @@ class AttckStixManager:
         return stix_group
 
     def get_matrices(self) -> list:
-        if not self._all_matrices:
-            self._all_matrices = self.attck_data.get_matrices(
-                remove_revoked_deprecated=True
-            )
-        return self._all_matrices
+        return self._all_matrices.get()
 
     def get_mitigations(self) -> list:
-        if not self._all_mitigations:
-            self._all_mitigations = self.attck_data.get_mitigations(
-                remove_revoked_deprecated=True
-            )
-        return self._all_mitigations
+        return self._all_mitigations.get()
 
     def get_tools(self) -> list:
-        software = self.attck_data.get_objects_by_type(
-            "tool", remove_revoked_deprecated=True
-        )
-        return software
+        return self._all_tools.get()
 
     def get_malware(self) -> list:
-        malware = self.attck_data.get_objects_by_type(
-            "malware", remove_revoked_deprecated=True
-        )
-        return malware
+        return self._all_malware.get()
 
     def get_software(self) -> list:
-        if not self._all_software:
-            self._all_software = self.attck_data.get_software(
-                remove_revoked_deprecated=True
-            )
-        return self._all_software
+        return self._all_software.get()
 
     def _filter_techniques(
         self, techniques: Iterable[AttackPattern]
@@ -212,30 +364,16 @@ class AttckStixManager:
                 yield software_data
 
     def get_subtechniques(self) -> list[AttackPattern]:
-        if not self._all_subtechniques:
-            self._all_subtechniques = self.attck_data.get_subtechniques(
-                remove_revoked_deprecated=True
-            )
-        return self._filter_techniques(self._all_subtechniques)
+        return self._filter_techniques(self._all_subtechniques.get())
 
     def get_techniques(self) -> list[AttackPattern]:
-        if not self._all_techniques:
-            self._all_techniques = self.attck_data.get_techniques(
-                remove_revoked_deprecated=True
-            )
-        return self._filter_techniques(self._all_techniques)
+        return self._filter_techniques(self._all_techniques.get())
 
     def get_tactics(self) -> list:
-        if not self._all_tactics:
-            self._all_tactics = self.attck_data.get_tactics(
-                remove_revoked_deprecated=True
-            )
-        return self._all_tactics
+        return self._all_tactics.get()
 
     def get_platforms(self) -> list[str]:
-        if not self._all_platforms:
-            self._update_platform_cache()
-        return self._all_platforms
+        return self._all_platforms.get()
 
     def platform_status(self, platform: str) -> dict[str, str | bool]:
         platforms = self.get_platforms()
@@ -244,6 +382,27 @@ class AttckStixManager:
         ignored = True if platform in self._ignored_platforms else False
         return {"name": platform, "ignored": ignored}
 
+    def _group_uses(self, group_id: str, target_types: str) -> list[dict]:
+        """Objects used by a group or its campaigns, as relationship maps.
+
+        Matches MitreAttackData's `get_*_used_by_group`, but is answered from the
+        graph so that only the returned objects are read from the store.
+        """
+        hop = f"uses:{target_types}"
+        results = self.graph.traverse(group_id, [hop])
+        for campaign_id in self.graph.traverse(group_id, ["~attributed-to:campaign"]):
+            for stix_id, paths in self.graph.traverse(campaign_id, [hop]).items():
+                results.setdefault(stix_id, []).extend(paths)
+        return [
+            {
+                "object": self.graph.get(stix_id),
+                "relationships": [
+                    self.attck_data.src.get(path[-1].id) for path in paths
+                ],
+            }
+            for stix_id, paths in results.items()
+        ]
+
     def _get_techniques_used_by_group(
         self, group: str | IntrusionSet
     ) -> list[dict[str, AttackPattern | list[Relationship]]]:
@@ -255,7 +414,9 @@ class AttckStixManager:
         if not group_id:
             raise ValueError
         rel_maps: list[dict[str, AttackPattern | list[Relationship]]] = (
-            self.attck_data.get_techniques_used_by_group(group_id)
+            self._group_uses(group_id, "attack-pattern")
+            if self.sqlite_store is not None
+            else self.attck_data.get_techniques_used_by_group(group_id)
         )
         techniques: Generator[AttackPattern, None, None] = (
             rel_map["object"] for rel_map in rel_maps
@@ -298,7 +459,9 @@ class AttckStixManager:
             raise ValueError
 
         rel_maps: list[dict[str, Malware | Tool | list[Relationship]]] = (
-            self.attck_data.get_software_used_by_group(group_id)
+            self._group_uses(group_id, "malware|tool")
+            if self.sqlite_store is not None
+            else self.attck_data.get_software_used_by_group(group_id)
         )
         for rel_map in rel_maps:
             obj = rel_map.get("object", None)
@@ -320,3 +483,279 @@ class AttckStixManager:
         for software_type, rel_map in software_data:
             software.setdefault(software_type, []).append(rel_map["object"])
         return software
+
+    def _is_node_visible(self, stix_id: str) -> bool:
+        platforms = self.graph.node_platforms(stix_id)
+        return not platforms.intersection(self._ignored_platforms)
+
+    def path_query(
+        self,
+        source: str | IntrusionSet,
+        hops: list[GraphHop | str],
+        max_paths: int | None = None,
+    ) -> GraphResults:
+        """Objects reachable from `source` along `hops`, with justifying paths.
+
+        Objects on ignored platforms are skipped, including intermediate ones.
+        At most `MAX_PATH_HOPS` hops are followed, `max_paths` paths are kept per
+        object (`DEFAULT_MAX_PATHS` if None, up to `MAX_PATHS`) and
+        `MAX_TOTAL_PATHS` paths overall.
+        """
+        source_id: str = (
+            source.get("id", "") if isinstance(source, IntrusionSet) else source
+        )
+        if not source_id:
+            raise ValueError
+        if not hops:
+            msg = "at least one hop is required"
+            raise ValueError(msg)
+        if len(hops) > self.MAX_PATH_HOPS:
+            msg = f"at most {self.MAX_PATH_HOPS} hops are allowed"
+            raise ValueError(msg)
+        if max_paths is None:
+            max_paths = self.DEFAULT_MAX_PATHS
+        if not 1 <= max_paths <= self.MAX_PATHS:
+            msg = f"max_paths must be between 1 and {self.MAX_PATHS}"
+            raise ValueError(msg)
+        return self.graph.traverse(
+            source_id,
+            hops,
+            node_filter=self._is_node_visible,
+            max_paths=max_paths,
+            max_total_paths=self.MAX_TOTAL_PATHS,
+        )
+
+    def _visible_closure(self, results: GraphResults) -> GraphResults:
+        visible: GraphResults = {}
+        for target_id, paths in results.items():
+            if not self._is_node_visible(target_id):
+                continue
+            visible_paths = [
+                path
+                for path in paths
+                if all(self._is_node_visible(edge.target_ref) for edge in path)
+            ]
+            if visible_paths:
+                visible[target_id] = visible_paths
+        return visible
+
+    def closure(self, name: str, source: str, reverse: bool = False) -> GraphResults:
+        """Look up a precomputed closure of the relationship graph.
+
+        Args:
+            name (str):
+                Closure name, see `AttckGraph.closures`.
+            source (str):
+                STIX ID to start from. When `reverse` is True, this is the target
+                end of the closure instead.
+            reverse (bool, optional):
+                Return the objects that reach `source` rather than the objects
+                reachable from it. Defaults to False.
+
+        Returns:
+            GraphResults:
+                Mapping of STIX IDs to the relationship paths that justify them.
+        """
+        if reverse:
+            return self._visible_closure(self.graph.closure_sources(name, source))
+        return self._visible_closure(self.graph.closure(name, source))
+
+    def techniques_used_by_group_transitive(
+        self, group: str | IntrusionSet
+    ) -> GraphResults:
+        return self.closure("group-technique", self._group_id(group))
+
+    def groups_using_technique(self, technique: str | AttackPattern) -> GraphResults:
+        technique_id: str = (
+            technique.get("id", "")
+            if isinstance(technique, AttackPattern)
+            else technique
+        )
+        if not technique_id:
+            raise ValueError
+        return self.closure("group-technique", technique_id, reverse=True)
+
+    def resolve_group(self, group: str | IntrusionSet) -> str:
+        """STIX ID of a group given as an object, a STIX ID or an ATT&CK ID.
+
+        Raises:
+            ValueError: `group` is not a known group.
+        """
+        ref = self._group_id(group)
+        group_id = self.graph.resolve(ref)
+        if group_id is None or self.graph.node_type(group_id) != "intrusion-set":
+            msg = f"invalid group: {ref}"
+            raise ValueError(msg)
+        return group_id
+
+    def group_coverage(self, groups: Iterable[str | IntrusionSet]) -> CoverageReport:
+        """Mitigations and data components covering the techniques of `groups`.
+
+        Techniques are those used by any of the groups or their campaigns, directly
+        or through software, excluding techniques on ignored platforms.
+
+        Raises:
+            ValueError: One of `groups` is not a known group.
+        """
+        techniques: set[str] = set()
+        for group in groups:
+            group_id = self.resolve_group(group)
+            techniques.update(self.techniques_used_by_group_transitive(group_id))
+        return self.coverage.report(techniques)
+
+    def _group_id(self, group: str | IntrusionSet) -> str:
+        group_id: str = (
+            group.get("id", "") if isinstance(group, IntrusionSet) else group
+        )
+        if not group_id:
+            raise ValueError
+        return group_id
+
+    def group_technique_ids(
+        self, group: str | IntrusionSet, transitive: bool = False
+    ) -> frozenset[str]:
+        """STIX IDs of the techniques used by `group`.
+
+        Args:
+            group (str | IntrusionSet):
+                The group or its STIX ID.
+            transitive (bool, optional):
+                Include techniques used through software. Techniques used by the
+                group's campaigns are always included, as in
+                `techniques_used_by_group`. Defaults to False.
+
+        Returns:
+            frozenset[str]: Technique IDs, excluding those on ignored platforms.
+        """
+        group_id = self._group_id(group)
+        if transitive:
+            return frozenset(self.techniques_used_by_group_transitive(group_id))
+        return frozenset(self.closure("group-direct-technique", group_id))
+
+    def tactic_technique_ids(
+        self,
+        tactic: str,
+        kill_chain: str | None = None,
+        group: str | IntrusionSet | None = None,
+        transitive: bool = False,
+    ) -> list[str]:
+        """STIX IDs of the techniques in a tactic, optionally used by `group`."""
+        technique_ids = self.tactics.techniques(tactic, kill_chain=kill_chain)
+        if group is not None:
+            technique_ids = technique_ids & self.group_technique_ids(
+                group, transitive=transitive
+            )
+        return sorted(filter(self._is_node_visible, technique_ids))
+
+    def techniques_in_tactic(
+        self,
+        tactic: str,
+        kill_chain: str | None = None,
+        group: str | IntrusionSet | None = None,
+        transitive: bool = False,
+    ) -> list[AttackPattern]:
+        technique_ids = self.tactic_technique_ids(
+            tactic, kill_chain=kill_chain, group=group, transitive=transitive
+        )
+        return [self.graph.get(technique_id) for technique_id in technique_ids]
+
+    def memory_report(self) -> dict[str, dict[str, int]]:
+        """Retained size of the loaded STIX objects by type, and of the indexes.
+
+        With a SQLite store, only the objects held in its cache are counted, and
+        the graph's lazy view of the database is not traversed.
+        """
+        indexes = {
+            "index:graph": self.graph,
+            "index:coverage": self.coverage,
+            "index:tactics": self.tactics,
+            "index:technique_query": self.technique_query,
+            "index:hierarchy": self.hierarchy,
+            "index:similarity": self.similarity,
+            "index:timeline": self.timeline,
+        }
+        sqlite_store = self.sqlite_store
+        if sqlite_store is not None:
+            return memory_report(
+                sqlite_store.source.cached_objects(),
+                extra=indexes,
+                opaque=(SQLiteObjects,),
+            )
+        return memory_report(self.attck_data.src.query(), extra=indexes)
+
+    def query_techniques(self, query: str = "") -> list[AttackPattern]:
+        """Techniques matching a technique query, see `AttckTechniqueQuery`.
+
+        Raises:
+            ValueError: The query is malformed.
+        """
+        technique_ids = self.technique_query(
+            query, ignored_platforms=self._ignored_platforms
+        )
+        return [self.graph.get(technique_id) for technique_id in technique_ids]
+
+    def group_techniques_rollup(
+        self, group: str | IntrusionSet, transitive: bool = False
+    ) -> list[TechniqueRollup]:
+        """Techniques used by `group`, nested under their parent techniques.
+
+        Parents on ignored platforms are kept with `visible` set to False when
+        any of their sub-techniques is shown.
+        """
+        return self.hierarchy.rollup(
+            self.group_technique_ids(group, transitive=transitive),
+            node_filter=self._is_node_visible,
+        )
+
+    def similar_techniques(
+        self, technique: str | AttackPattern, k: int = 10
+    ) -> list[SimilarTechnique]:
+        """Techniques with the most similar descriptions to `technique`.
+
+        Args:
+            technique (str | AttackPattern):
+                The technique, its STIX ID or its ATT&CK ID.
+            k (int, optional):
+                Number of neighbours to return. Defaults to 10.
+
+        Raises:
+            ValueError: `technique` is not a known technique.
+
+        Returns:
+            list[SimilarTechnique]:
+                Neighbours, most similar first, excluding techniques on ignored
+                platforms.
+        """
+        ref: str = (
+            technique.get("id", "")
+            if isinstance(technique, AttackPattern)
+            else technique
+        )
+        technique_id = self.graph.resolve(ref)
+        if technique_id not in self.similarity.technique_ids:
+            msg = f"invalid technique: {ref}"
+            raise ValueError(msg)
+        hidden = (
+            t for t in self.similarity.technique_ids if not self._is_node_visible(t)
+        )
+        return self.similarity.similar(technique_id, k=k, exclude=hidden)
+
+    def campaign_activity(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> CampaignActivity:
+        """Campaigns active between `start` and `end`, with groups and techniques.
+
+        Techniques on ignored platforms are left out.
+        """
+        activity = self.timeline.activity(start, end)
+        return activity._replace(
+            techniques=frozenset(filter(self._is_node_visible, activity.techniques))
+        )
+
+    def campaign_techniques(self, campaign: str) -> frozenset[str]:
+        techniques = self.timeline.campaign_techniques.get(campaign, frozenset())
+        return frozenset(filter(self._is_node_visible, techniques))
+
+    def group_timeline(self, group: str | IntrusionSet) -> list[CampaignInterval]:
+        """Campaigns attributed to `group`, ordered by first seen."""
+        return self.timeline.group_timeline(self._group_id(group))
@@ -0,0 +1,90 @@
+from attck_stix_agent.attck.attck_graph import AttckGraph
+
+
+class AttckTacticIndex:
+    """Kill chain phase indexes built from the relationship graph.
+
+    Phases are ordered by the tactic order of the loaded matrices. Phases that no
+    matrix references are placed after the ordered ones, alphabetically.
+    """
+
+    def __init__(self, graph: AttckGraph) -> None:
+        self.tactic_order: list[str] = self._tactic_order(graph)
+        self._rank: dict[str, int] = {
+            phase: idx for idx, phase in enumerate(self.tactic_order)
+        }
+
+        phase_techniques: dict[str, dict[str, set[str]]] = {}
+        technique_phases: dict[str, dict[str, list[str]]] = {}
+        for technique_id in graph.ids_by_type("attack-pattern"):
+            technique = graph.get(technique_id)
+            kill_chains: dict[str, list[str]] = {}
+            for phase_obj in technique.get("kill_chain_phases", []):
+                kill_chain_name: str = phase_obj.get("kill_chain_name", "unknown")
+                phase_name: str = phase_obj.get("phase_name", "")
+                phases = kill_chains.setdefault(kill_chain_name, [])
+                if phase_name not in phases:
+                    phases.append(phase_name)
+                phase_techniques.setdefault(kill_chain_name, {}).setdefault(
+                    phase_name, set()
+                ).add(technique_id)
+            for phases in kill_chains.values():
+                phases.sort(key=self._phase_key)
+            technique_phases[technique_id] = kill_chains
+
+        self.technique_phases: dict[str, dict[str, list[str]]] = technique_phases
+        self.phase_techniques: dict[str, dict[str, frozenset[str]]] = {
+            kill_chain: {
+                phase: frozenset(kill_chain_phases[phase])
+                for phase in sorted(kill_chain_phases, key=self._phase_key)
+            }
+            for kill_chain, kill_chain_phases in phase_techniques.items()
+        }
+
+    @staticmethod
+    def _tactic_order(graph: AttckGraph) -> list[str]:
+        order: list[str] = []
+        for matrix_id in graph.ids_by_type("x-mitre-matrix"):
+            for tactic_id in graph.get(matrix_id).get("tactic_refs", []):
+                tactic = graph.get(tactic_id)
+                if tactic is None:
+                    continue
+                phase_name = tactic.get("x_mitre_shortname", "")
+                if phase_name and phase_name not in order:
+                    order.append(phase_name)
+        return order
+
+    def _phase_key(self, phase: str) -> tuple[int, str]:
+        return (self._rank.get(phase, len(self._rank)), phase)
+
+    def kill_chains(self) -> list[str]:
+        return sorted(self.phase_techniques)
+
+    def phases(self, kill_chain: str | None = None) -> list[str]:
+        """Phases of `kill_chain` (or of all kill chains) in tactic order."""
+        if kill_chain is not None:
+            return list(self.phase_techniques.get(kill_chain, {}))
+        phases: set[str] = set()
+        for kill_chain_phases in self.phase_techniques.values():
+            phases.update(kill_chain_phases)
+        return sorted(phases, key=self._phase_key)
+
+    def techniques(self, phase: str, kill_chain: str | None = None) -> frozenset[str]:
+        """STIX IDs of the techniques in `phase`.
+
+        Args:
+            phase (str):
+                Phase name, i.e. the tactic's `x_mitre_shortname`.
+            kill_chain (str, optional):
+                Only consider phases of this kill chain. All kill chains are
+                considered if None. Defaults to None.
+
+        Returns:
+            frozenset[str]: STIX IDs of the techniques in the phase.
+        """
+        if kill_chain is not None:
+            return self.phase_techniques.get(kill_chain, {}).get(phase, frozenset())
+        techniques: set[str] = set()
+        for kill_chain_phases in self.phase_techniques.values():
+            techniques.update(kill_chain_phases.get(phase, ()))
+        return frozenset(techniques)
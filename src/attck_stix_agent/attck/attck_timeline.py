@@ -0,0 +1,139 @@
+from datetime import UTC, datetime
+from typing import NamedTuple
+
+from attck_stix_agent.attck.attck_graph import AttckGraph
+
+MIN_TIME = datetime.min.replace(tzinfo=UTC)
+MAX_TIME = datetime.max.replace(tzinfo=UTC)
+
+
+class CampaignInterval(NamedTuple):
+    id: str
+    start: datetime
+    end: datetime
+
+
+class CampaignActivity(NamedTuple):
+    campaigns: list[CampaignInterval]
+    groups: frozenset[str]
+    techniques: frozenset[str]
+
+
+def _to_datetime(value: object, default: datetime) -> datetime:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=UTC)
+    if isinstance(value, str) and value:
+        parsed = datetime.fromisoformat(value)
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+    return default
+
+
+class AttckCampaignTimeline:
+    """Interval index over campaign activity windows.
+
+    Campaigns are indexed by their `first_seen`/`last_seen` window (open-ended
+    when a bound is missing) and joined to the groups they are attributed to and
+    the techniques they use, directly or through software.
+
+    Intervals are sorted by start and laid out as an implicit balanced binary
+    tree, each node also storing the latest end in its subtree. Overlap queries
+    descend only into subtrees that can hold a match, which takes
+    O(log n + k log n) for k matching campaigns.
+    """
+
+    def __init__(self, graph: AttckGraph) -> None:
+        intervals: list[CampaignInterval] = []
+        self.campaign_groups: dict[str, frozenset[str]] = {}
+        self.campaign_techniques: dict[str, frozenset[str]] = {}
+        for campaign_id in graph.ids_by_type("campaign"):
+            campaign = graph.get(campaign_id)
+            start = _to_datetime(campaign.get("first_seen", None), MIN_TIME)
+            end = _to_datetime(campaign.get("last_seen", None), MAX_TIME)
+            intervals.append(CampaignInterval(campaign_id, start, end))
+            self.campaign_groups[campaign_id] = frozenset(
+                graph.closure("campaign-group", campaign_id)
+            )
+            self.campaign_techniques[campaign_id] = frozenset(
+                graph.closure("campaign-technique", campaign_id)
+            )
+        intervals.sort(key=lambda interval: (interval.start, interval.end))
+        self.intervals: list[CampaignInterval] = intervals
+        self._max_end: list[datetime] = [interval.end for interval in intervals]
+        self._build(0, len(intervals))
+
+        self.group_campaigns: dict[str, list[CampaignInterval]] = {}
+        for interval in intervals:
+            for group_id in self.campaign_groups[interval.id]:
+                self.group_campaigns.setdefault(group_id, []).append(interval)
+
+    def _build(self, lo: int, hi: int) -> datetime:
+        if lo >= hi:
+            return MIN_TIME
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(
+            self.intervals[mid].end, self._build(lo, mid), self._build(mid + 1, hi)
+        )
+        return self._max_end[mid]
+
+    def _overlapping(
+        self,
+        lo: int,
+        hi: int,
+        start: datetime,
+        end: datetime,
+        out: list[CampaignInterval],
+    ) -> None:
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        # Nothing in this subtree is still active at `start`.
+        if self._max_end[mid] < start:
+            return
+        self._overlapping(lo, mid, start, end, out)
+        # This interval and everything to its right start after `end`.
+        if self.intervals[mid].start > end:
+            return
+        if self.intervals[mid].end >= start:
+            out.append(self.intervals[mid])
+        self._overlapping(mid + 1, hi, start, end, out)
+
+    def between(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> list[CampaignInterval]:
+        """Campaigns active at any time between `start` and `end`, inclusive.
+
+        Args:
+            start (datetime, optional):
+                Start of the range. Unbounded if None. Defaults to None.
+            end (datetime, optional):
+                End of the range. Unbounded if None. Defaults to None.
+
+        Returns:
+            list[CampaignInterval]: Matching campaigns, ordered by first seen.
+        """
+        start = _to_datetime(start, MIN_TIME)
+        end = _to_datetime(end, MAX_TIME)
+        if start > end:
+            return []
+        out: list[CampaignInterval] = []
+        self._overlapping(0, len(self.intervals), start, end, out)
+        return out
+
+    def activity(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> CampaignActivity:
+        """Campaigns active in a range, with their groups and techniques."""
+        campaigns = self.between(start, end)
+        groups: set[str] = set()
+        techniques: set[str] = set()
+        for campaign in campaigns:
+            groups.update(self.campaign_groups[campaign.id])
+            techniques.update(self.campaign_techniques[campaign.id])
+        return CampaignActivity(
+            campaigns=campaigns,
+            groups=frozenset(groups),
+            techniques=frozenset(techniques),
+        )
+
+    def group_timeline(self, group_id: str) -> list[CampaignInterval]:
+        return self.group_campaigns.get(group_id, [])[:]
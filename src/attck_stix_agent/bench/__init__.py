@@ -0,0 +1,4 @@
+from attck_stix_agent.bench._serve import bench_serve
+from attck_stix_agent.bench._synthetic import synthetic_bundle
+
+__all__ = ["bench_serve", "synthetic_bundle"]
@@ -0,0 +1,340 @@
+import json
+import math
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, NamedTuple, Self
+
+import requests
+
+from attck_stix_agent.api import HTTP_CACHE_ENV, STIX_SRC_ENV
+from attck_stix_agent.bench._synthetic import synthetic_bundle
+
+DEFAULT_MIX = "groups=1,group=3,techniques=4,software=3,platform=1"
+
+
+class BenchRequest(NamedTuple):
+    endpoint: str
+    method: str
+    path: str
+
+
+class BenchSample(NamedTuple):
+    endpoint: str
+    latency: float
+    ok: bool
+
+
+def _peak_rss_kb() -> int | None:
+    try:
+        import resource  # noqa: PLC0415
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(sorted_values: Sequence[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile.
+    rank = max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _latency_summary(latencies: Sequence[float]) -> dict[str, float]:
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "mean": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50": round(_percentile(values, 50) * 1000, 3),
+        "p95": round(_percentile(values, 95) * 1000, 3),
+        "p99": round(_percentile(values, 99) * 1000, 3),
+        "max": round(values[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def _parse_ints(value: str) -> list[int]:
+    try:
+        ints = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError as e:
+        msg = f"invalid integer list: '{value}'"
+        raise ValueError(msg) from e
+    if not ints or any(i < 1 for i in ints):
+        msg = f"expected positive integers: '{value}'"
+        raise ValueError(msg)
+    return ints
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for item in value.split(","):
+        endpoint, _, weight = item.partition("=")
+        endpoint = endpoint.strip()
+        if endpoint not in _REQUEST_BUILDERS:
+            msg = f"unknown endpoint in mix: '{endpoint}'"
+            raise ValueError(msg)
+        mix[endpoint] = int(weight or 1)
+    if not any(mix.values()):
+        msg = f"request mix has no weight: '{value}'"
+        raise ValueError(msg)
+    return mix
+
+
+_REQUEST_BUILDERS: dict[
+    str, Callable[[random.Random, list[str], list[str]], BenchRequest]
+] = {
+    "groups": lambda _, __, ___: BenchRequest("groups", "GET", "/groups"),
+    "group": lambda rng, groups, _: BenchRequest(
+        "group", "GET", f"/group/{rng.choice(groups)}"
+    ),
+    "techniques": lambda rng, groups, _: BenchRequest(
+        "techniques", "GET", f"/group/{rng.choice(groups)}/techniques"
+    ),
+    "software": lambda rng, groups, _: BenchRequest(
+        "software", "GET", f"/group/{rng.choice(groups)}/software"
+    ),
+    # Platform writes toggle the state version, so the HTTP cache is invalidated
+    # as it would be by real writes instead of replaying cached bodies.
+    "platform": lambda rng, _, platforms: BenchRequest(
+        "platform",
+        "PATCH",
+        f"/platform/{rng.choice(platforms)}?ignore={rng.choice(('true', 'false'))}",
+    ),
+}
+
+
+def _request_plan(
+    mix: dict[str, int],
+    count: int,
+    groups: list[str],
+    platforms: list[str],
+    rng: random.Random,
+) -> list[BenchRequest]:
+    endpoints = [endpoint for endpoint, weight in mix.items() if weight > 0]
+    weights = [mix[endpoint] for endpoint in endpoints]
+    return [
+        _REQUEST_BUILDERS[endpoint](rng, groups, platforms)
+        for endpoint in rng.choices(endpoints, weights=weights, k=count)
+    ]
+
+
+def _write_synthetic_bundle(bundle_path: Path, **kwargs: Any) -> int:
+    bundle = synthetic_bundle(**kwargs)
+    bundle_path.write_text(json.dumps(bundle))
+    return len(bundle["objects"])
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class _InProcessServer:
+    def __init__(self, host: str, log_level: str = "warning") -> None:
+        from uvicorn import Config, Server  # noqa: PLC0415
+
+        from attck_stix_agent.api.api import api, stix_manager  # noqa: PLC0415
+
+        stix_manager.warm_caches()
+        self.host = host
+        self.port = _free_port(host)
+        self._server = Server(
+            Config(app=api, host=host, port=self.port, log_level=log_level)
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                msg = "benchmark server failed to start"
+                raise RuntimeError(msg)
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def _run_level(
+    base_url: str, plan: list[BenchRequest], concurrency: int
+) -> dict[str, Any]:
+    local = threading.local()
+
+    def send(bench_request: BenchRequest) -> BenchSample:
+        session: requests.Session | None = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            resp = session.request(
+                bench_request.method, f"{base_url}{bench_request.path}", timeout=60
+            )
+            _ = resp.content
+            ok = resp.ok
+        except requests.RequestException:
+            ok = False
+        return BenchSample(bench_request.endpoint, time.perf_counter() - start, ok)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(send, plan))
+    duration = time.perf_counter() - start
+
+    by_endpoint: dict[str, list[float]] = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample.endpoint, []).append(sample.latency)
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": sum(not sample.ok for sample in samples),
+        "duration_s": round(duration, 3),
+        "rps": round(len(samples) / duration, 2) if duration else 0.0,
+        "latency_ms": _latency_summary([sample.latency for sample in samples]),
+        "endpoints": {
+            endpoint: {"requests": len(latencies), **_latency_summary(latencies)}
+            for endpoint, latencies in sorted(by_endpoint.items())
+        },
+    }
+
+
+def _compare(results: list[dict], baseline: dict) -> None:
+    baseline_levels = {
+        level["concurrency"]: level for level in baseline.get("levels", [])
+    }
+    for level in results:
+        base = baseline_levels.get(level["concurrency"], None)
+        if base is None:
+            continue
+        deltas: dict[str, float | None] = {}
+        for key, current, previous in (
+            ("rps", level["rps"], base["rps"]),
+            ("p50", level["latency_ms"]["p50"], base["latency_ms"]["p50"]),
+            ("p99", level["latency_ms"]["p99"], base["latency_ms"]["p99"]),
+        ):
+            deltas[f"{key}_pct"] = (
+                round((current - previous) / previous * 100, 2) if previous else None
+            )
+        level["baseline_delta"] = deltas
+
+
+def bench_serve(
+    stix_src: str | None = None,
+    concurrency: str = "1,8,32",
+    requests_per_level: int = 500,
+    mix: str = DEFAULT_MIX,
+    warmup: int = 50,
+    synthetic_groups: int = 100,
+    synthetic_techniques: int = 600,
+    synthetic_software: int = 300,
+    seed: int = 0,
+    host: str = "127.0.0.1",
+    output: Path | None = None,
+    baseline: Path | None = None,
+    http_cache: bool = True,
+) -> None:
+    """Load-test the API in-process and report throughput and latency as JSON.
+
+    The API is served from a local STIX bundle, or from a synthetic bundle when
+    no source is given, and a weighted mix of requests is replayed at each
+    concurrency level. Peak RSS covers the whole process, i.e. the server and the
+    load generator, but not the generation of the synthetic bundle. With
+    `http_cache` disabled, every request is served by its endpoint instead of
+    from the HTTP response cache.
+    """
+    levels = _parse_ints(concurrency)
+    request_mix = _parse_mix(mix)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source: dict[str, Any] = {"stix_src": stix_src}
+        if stix_src is None:
+            bundle_path = Path(tmp_dir).joinpath("synthetic-attack.json")
+            # Generated in a child process so that it does not count towards the
+            # peak RSS of the server.
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=get_context("spawn")
+            ) as executor:
+                object_count = executor.submit(
+                    _write_synthetic_bundle,
+                    bundle_path,
+                    groups=synthetic_groups,
+                    techniques=synthetic_techniques,
+                    software=synthetic_software,
+                    seed=seed,
+                ).result()
+            stix_src = str(bundle_path)
+            source = {
+                "synthetic": {
+                    "groups": synthetic_groups,
+                    "techniques": synthetic_techniques,
+                    "software": synthetic_software,
+                    "objects": object_count,
+                    "seed": seed,
+                }
+            }
+        os.environ[STIX_SRC_ENV] = stix_src
+        if not http_cache:
+            os.environ[HTTP_CACHE_ENV] = "0"
+
+        load_start = time.perf_counter()
+        with _InProcessServer(host) as server:
+            load_time = time.perf_counter() - load_start
+            with requests.Session() as session:
+                groups = [
+                    group["id"]
+                    for group in session.get(
+                        f"{server.base_url}/groups", timeout=60
+                    ).json()
+                ]
+                if not groups:
+                    msg = "benchmark bundle contains no groups"
+                    raise ValueError(msg)
+                platforms = session.get(
+                    f"{server.base_url}/platforms", timeout=60
+                ).json()
+
+            rng = random.Random(seed)  # noqa: S311
+            if warmup:
+                warmup_plan = _request_plan(request_mix, warmup, groups, platforms, rng)
+                _ = _run_level(server.base_url, warmup_plan, max(levels))
+            results: list[dict[str, Any]] = []
+            for level in levels:
+                plan = _request_plan(
+                    request_mix, requests_per_level, groups, platforms, rng
+                )
+                results.append(_run_level(server.base_url, plan, level))
+
+    if baseline is not None:
+        _compare(results, json.loads(baseline.read_text()))
+
+    report = {
+        "source": source,
+        "mix": request_mix,
+        "http_cache": http_cache,
+        "startup_s": round(load_time, 3),
+        "levels": results,
+        "peak_rss_kb": _peak_rss_kb(),
+        "python": platform.python_version(),
+    }
+    report_json = json.dumps(report, indent=2)
+    if output is not None:
+        output.write_text(report_json)
+    else:
+        print(report_json)
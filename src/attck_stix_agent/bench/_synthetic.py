@@ -0,0 +1,178 @@
+import random
+import uuid
+from typing import Any
+
+SYNTHETIC_TIMESTAMP = "2020-01-01T00:00:00.000Z"
+SYNTHETIC_PLATFORMS: tuple[str, ...] = ("Windows", "Linux", "macOS", "Network")
+SYNTHETIC_TACTICS: tuple[str, ...] = (
+    "initial-access",
+    "execution",
+    "persistence",
+    "privilege-escalation",
+    "defense-evasion",
+    "credential-access",
+    "discovery",
+    "lateral-movement",
+    "collection",
+    "exfiltration",
+)
+
+
+class _SyntheticBundle:
+    def __init__(self, seed: int) -> None:
+        self.rng = random.Random(seed)  # noqa: S311
+        self.objects: list[dict[str, Any]] = []
+
+    def stix_id(self, stix_type: str) -> str:
+        return f"{stix_type}--{uuid.UUID(int=self.rng.getrandbits(128), version=4)}"
+
+    def add(self, stix_type: str, attck_id: str | None = None, **props: Any) -> str:
+        stix_obj: dict[str, Any] = {
+            "type": stix_type,
+            "id": self.stix_id(stix_type),
+            "created": SYNTHETIC_TIMESTAMP,
+            "modified": SYNTHETIC_TIMESTAMP,
+            **props,
+        }
+        if attck_id is not None:
+            stix_obj["external_references"] = [
+                {"source_name": "mitre-attack", "external_id": attck_id}
+            ]
+        self.objects.append(stix_obj)
+        return stix_obj["id"]
+
+    def relate(self, source_ref: str, relationship_type: str, target_ref: str) -> None:
+        _ = self.add(
+            "relationship",
+            relationship_type=relationship_type,
+            source_ref=source_ref,
+            target_ref=target_ref,
+        )
+
+    def platforms(self) -> list[str]:
+        return self.rng.sample(SYNTHETIC_PLATFORMS, k=self.rng.randint(1, 3))
+
+
+def _add_techniques(bundle: _SyntheticBundle, techniques: int) -> list[str]:
+    rng = bundle.rng
+    parents: list[str] = []
+    technique_ids: list[str] = []
+    for idx in range(techniques):
+        parent_idx = None
+        if parents and idx % 3 == 2:
+            parent_idx = rng.randrange(len(parents))
+        attck_id = f"T{1000 + idx:04d}"
+        if parent_idx is not None:
+            attck_id = f"T{1000 + parent_idx:04d}.{idx:03d}"
+        technique_id = bundle.add(
+            "attack-pattern",
+            attck_id=attck_id,
+            name=f"Technique {idx}",
+            description=f"Synthetic technique {idx}. (Citation: Synthetic {idx})",
+            kill_chain_phases=[
+                {"kill_chain_name": "mitre-attack", "phase_name": phase}
+                for phase in rng.sample(SYNTHETIC_TACTICS, k=rng.randint(1, 2))
+            ],
+            x_mitre_platforms=bundle.platforms(),
+            x_mitre_data_sources=[f"Source {rng.randrange(20)}: Component {idx % 40}"],
+            x_mitre_is_subtechnique=parent_idx is not None,
+        )
+        technique_ids.append(technique_id)
+        if parent_idx is None:
+            parents.append(technique_id)
+        else:
+            bundle.relate(technique_id, "subtechnique-of", parents[parent_idx])
+    return technique_ids
+
+
+def _relate_sample(
+    bundle: _SyntheticBundle,
+    source_ref: str,
+    relationship_type: str,
+    targets: list[str],
+    k: int,
+) -> None:
+    for target_ref in bundle.rng.sample(targets, k=min(k, len(targets))):
+        bundle.relate(source_ref, relationship_type, target_ref)
+
+
+def synthetic_bundle(
+    groups: int = 100,
+    techniques: int = 600,
+    software: int = 300,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Generate a STIX 2.0 bundle shaped like the ATT&CK Enterprise dataset.
+
+    Args:
+        groups (int, optional):
+            Number of groups. Defaults to 100.
+        techniques (int, optional):
+            Number of techniques; about a third of them are sub-techniques.
+            Defaults to 600.
+        software (int, optional):
+            Number of software entries, split between malware and tools.
+            Defaults to 300.
+        seed (int, optional):
+            Random seed, so the same arguments give the same bundle. Defaults to 0.
+
+    Returns:
+        dict[str, Any]: The bundle, ready to be serialized as JSON.
+    """
+    bundle = _SyntheticBundle(seed)
+
+    tactic_refs = [
+        bundle.add(
+            "x-mitre-tactic",
+            attck_id=f"TA{idx:04d}",
+            name=phase.replace("-", " ").title(),
+            x_mitre_shortname=phase,
+        )
+        for idx, phase in enumerate(SYNTHETIC_TACTICS, start=1)
+    ]
+    _ = bundle.add(
+        "x-mitre-matrix",
+        attck_id="enterprise-attack",
+        name="Synthetic ATT&CK",
+        tactic_refs=tactic_refs,
+    )
+
+    technique_ids = _add_techniques(bundle, techniques)
+
+    software_ids: list[str] = []
+    for idx in range(software):
+        software_type = "malware" if idx % 2 else "tool"
+        software_id = bundle.add(
+            software_type,
+            attck_id=f"S{idx:04d}",
+            name=f"Software {idx}",
+            description=f"Synthetic {software_type} {idx}.",
+            labels=[software_type],
+            x_mitre_platforms=bundle.platforms(),
+        )
+        software_ids.append(software_id)
+        _relate_sample(bundle, software_id, "uses", technique_ids, k=8)
+
+    for idx in range(groups):
+        group_id = bundle.add(
+            "intrusion-set",
+            attck_id=f"G{idx:04d}",
+            name=f"Group {idx}",
+            description=f"Synthetic group {idx}.",
+            aliases=[f"Group {idx}"],
+        )
+        _relate_sample(bundle, group_id, "uses", technique_ids, k=40)
+        _relate_sample(bundle, group_id, "uses", software_ids, k=6)
+
+    for idx in range(max(techniques // 10, 1)):
+        mitigation_id = bundle.add(
+            "course-of-action", attck_id=f"M{1000 + idx}", name=f"Mitigation {idx}"
+        )
+        _relate_sample(bundle, mitigation_id, "mitigates", technique_ids, k=12)
+
+    return {
+        "type": "bundle",
+        "id": bundle.stix_id("bundle"),
+        "spec_version": "2.0",
+        "objects": bundle.objects,
+    }
@@ -1,10 +1,12 @@
 from typer import Typer
 
 from attck_stix_agent.api import serve_api
+from attck_stix_agent.bench import bench_serve
 
 cli = Typer()
 
 cli.command("serve")(serve_api)
+cli.command("bench-serve")(bench_serve)
 
 
 def run_cli() -> None:
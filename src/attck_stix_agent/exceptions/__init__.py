@@ -1,3 +1,7 @@
-from attck_stix_agent.exceptions._stix import StixImportError, StixTypeMismatchError
+from attck_stix_agent.exceptions._stix import (
+    StixChecksumError,
+    StixImportError,
+    StixTypeMismatchError,
+)
 
-__all__ = ["StixImportError", "StixTypeMismatchError"]
+__all__ = ["StixChecksumError", "StixImportError", "StixTypeMismatchError"]
@@ -2,5 +2,9 @@ class StixImportError(Exception):
     pass
 
 
+class StixChecksumError(StixImportError):
+    pass
+
+
 class StixTypeMismatchError(Exception):
     pass
@@ -1,4 +1,12 @@
+from attck_stix_agent.util._checksum import (
+    file_checksum,
+    find_checksum,
+    read_checksum_manifest,
+    read_checksum_sidecar,
+)
+from attck_stix_agent.util._lazy import LazyValue, warm_lazy_values
 from attck_stix_agent.util._path import (
+    COMPRESSED_SUFFIXES,
     make_file_parent,
     read_and_parse_file,
     read_file,
@@ -8,10 +16,17 @@ from attck_stix_agent.util._path import (
 )
 
 __all__ = [
+    "COMPRESSED_SUFFIXES",
+    "LazyValue",
+    "file_checksum",
+    "find_checksum",
     "make_file_parent",
     "read_and_parse_file",
+    "read_checksum_manifest",
+    "read_checksum_sidecar",
     "read_file",
     "read_file_bytes",
     "read_file_text",
     "to_path",
+    "warm_lazy_values",
 ]
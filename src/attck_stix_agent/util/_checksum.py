@@ -0,0 +1,109 @@
+import hashlib
+from os import PathLike
+from pathlib import Path, PurePath
+
+from attck_stix_agent.exceptions import StixChecksumError
+from attck_stix_agent.util._path import to_path
+
+DEFAULT_CHECKSUM_ALGORITHM = "sha256"
+CHECKSUM_MANIFEST_NAME = "SHA256SUMS"
+
+
+def file_checksum(
+    __path: str | PathLike, algorithm: str = DEFAULT_CHECKSUM_ALGORITHM
+) -> str:
+    fp: Path = to_path(__path)
+    with fp.open("rb") as fh:
+        return hashlib.file_digest(fh, algorithm).hexdigest()
+
+
+def read_checksum_manifest(__path: str | PathLike) -> dict[str, str]:
+    """Read a `sha256sum`-style manifest.
+
+    Each line holds a hex digest and a file name separated by whitespace. A `*`
+    prefix on the file name (binary mode marker) is ignored.
+
+    Returns:
+        dict[str, str]: Mapping of file names to lowercase hex digests.
+    """
+    fp: Path = to_path(__path)
+    checksums: dict[str, str] = {}
+    for raw_line in fp.read_text().splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        digest, _, file_name = line.partition(" ")
+        file_name = file_name.strip().removeprefix("*")
+        if not file_name:
+            msg = f"invalid checksum manifest line: '{line}'"
+            raise ValueError(msg)
+        checksums[file_name] = digest.lower()
+    return checksums
+
+
+def _manifest_entry(checksums: dict[str, str], fp: Path) -> str | None:
+    # `sha256sum` records files as given on its command line, which may be a path.
+    if fp.name in checksums:
+        return checksums[fp.name]
+    for file_name, digest in checksums.items():
+        if PurePath(file_name).name == fp.name:
+            return digest
+    return None
+
+
+def read_checksum_sidecar(__path: str | PathLike, file_name: str) -> str:
+    """Read the expected checksum of `file_name` from a `<file>.sha256` sidecar.
+
+    The sidecar either holds the hex digest alone or is a `sha256sum`-style
+    manifest with an entry for the file, listed by name or by path.
+
+    Raises:
+        StixChecksumError: The sidecar has no entry for `file_name`.
+
+    Returns:
+        str: The expected lowercase hex digest.
+    """
+    fp: Path = to_path(__path)
+    lines = [
+        line.strip()
+        for line in fp.read_text().splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    ]
+    if len(lines) == 1 and len(lines[0].split()) == 1:
+        return lines[0].lower()
+    digest = _manifest_entry(read_checksum_manifest(fp), fp.with_name(file_name))
+    if digest is None:
+        msg = f"no checksum for '{file_name}' in '{fp}'"
+        raise StixChecksumError(msg)
+    return digest
+
+
+def find_checksum(__path: str | PathLike) -> str | None:
+    """Find the expected checksum of a file.
+
+    Looks for a `<file>.sha256` file next to it first, then for an entry in a
+    `SHA256SUMS` manifest in the same directory. An existing sidecar is
+    authoritative, see `read_checksum_sidecar`.
+
+    Raises:
+        StixChecksumError: The sidecar has no entry for the file.
+
+    Returns:
+        str | None: The expected hex digest, or None if no manifest lists the file.
+    """
+    fp: Path = to_path(__path)
+    sidecar = fp.with_name(f"{fp.name}.sha256")
+    if sidecar.is_file():
+        return read_checksum_sidecar(sidecar, fp.name)
+    manifest = fp.with_name(CHECKSUM_MANIFEST_NAME)
+    if manifest.is_file():
+        return _manifest_entry(read_checksum_manifest(manifest), fp)
+    return None
+
+
+__all__ = [
+    "file_checksum",
+    "find_checksum",
+    "read_checksum_manifest",
+    "read_checksum_sidecar",
+]
@@ -0,0 +1,72 @@
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+_UNSET = object()
+
+
+class LazyValue(Generic[T]):
+    """Thread-safe, lazily computed value.
+
+    The factory runs at most once, no matter how many threads ask for the value
+    concurrently: the first caller computes it while the others wait for its
+    result. Any computed value, including an empty one, is kept until `reset`.
+    If the factory raises, nothing is stored and the next caller retries.
+
+    With `retain=False` nothing is stored and the factory runs on every call, for
+    values that are cheaper to recompute than to hold.
+    """
+
+    def __init__(self, factory: Callable[[], T], retain: bool = True) -> None:
+        self._factory: Callable[[], T] = factory
+        self.retain: bool = retain
+        self._lock: Lock = Lock()
+        self._value: T | object = _UNSET
+
+    @property
+    def is_set(self) -> bool:
+        return self._value is not _UNSET
+
+    def get(self) -> T:
+        if not self.retain:
+            return self._factory()
+        value = self._value
+        if value is _UNSET:
+            with self._lock:
+                value = self._value
+                if value is _UNSET:
+                    value = self._factory()
+                    self._value = value
+        return value  # pyright: ignore [reportReturnType]
+
+    def set(self, value: T) -> None:
+        with self._lock:
+            self._value = value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._value = _UNSET
+
+
+def warm_lazy_values(
+    lazy_values: Iterable[LazyValue], max_workers: int | None = None
+) -> None:
+    """Compute lazy values ahead of first use.
+
+    Values are computed concurrently when `max_workers` is greater than one.
+    Values that are not retained are skipped.
+    """
+    lazy_values = [v for v in lazy_values if v.retain and not v.is_set]
+    if max_workers is None or max_workers <= 1:
+        for lazy_value in lazy_values:
+            _ = lazy_value.get()
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for future in [executor.submit(v.get) for v in lazy_values]:
+            _ = future.result()
+
+
+__all__ = ["LazyValue", "warm_lazy_values"]
@@ -1,8 +1,12 @@
+import gzip
+import lzma
 from collections.abc import Callable
 from io import BufferedIOBase
 from os import PathLike
 from pathlib import Path
-from typing import Any, Literal
+from typing import IO, Any, Literal
+
+COMPRESSED_SUFFIXES: tuple[str, ...] = (".gz", ".xz")
 
 
 def to_path(__path: str | PathLike) -> Path:
@@ -25,6 +29,15 @@ def make_file_parent(__path: str | PathLike) -> None:
     parent.mkdir(parents=True, exist_ok=True)
 
 
+def _open_file(fp: Path, mode: Literal["b", "t"]) -> IO:
+    # Compressed files are decompressed as they are read.
+    if fp.suffix == ".gz":
+        return gzip.open(fp, f"r{mode}")
+    if fp.suffix == ".xz":
+        return lzma.open(fp, f"r{mode}")
+    return fp.open(f"r{mode}")
+
+
 def _read_file(
     __path: str | PathLike,
     mode: Literal["b", "t"],
@@ -32,7 +45,7 @@ def _read_file(
 ) -> bytes | str:
     fp: Path = to_path(__path)
 
-    with fp.open(f"r{mode}") as fh:
+    with _open_file(fp, mode=mode) as fh:
         if parser is not None:
             if not isinstance(fh, BufferedIOBase):
                 raise TypeError
@@ -79,6 +92,7 @@ def read_and_parse_file(
 
 
 __all__ = [
+    "COMPRESSED_SUFFIXES",
     "make_file_parent",
     "read_and_parse_file",
     "read_file",
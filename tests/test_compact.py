@@ -0,0 +1,37 @@
+import json
+import sys
+from pathlib import Path
+
+from attck_stix_agent._compact import StixCompactor
+from attck_stix_agent.attck import AttckStixManager
+from attck_stix_agent.bench import synthetic_bundle
+
+COLLECTION = {
+    "type": "x-mitre-collection",
+    "id": "x-mitre-collection--1f5f1533-f617-4ca8-9ab4-6a02367fa019",
+    "created": "2018-01-17T12:56:55.080Z",
+    "modified": "2024-10-31T15:10:17.633Z",
+    "name": "Enterprise ATT&CK",
+    "x_mitre_version": "16.1",
+    "x_mitre_contents": [],
+}
+
+
+def test_compact_plain_dict() -> None:
+    # A fresh, non-interned copy of the name.
+    stix_obj = {**COLLECTION, "name": COLLECTION["name"].encode().decode()}
+    stats = StixCompactor()([stix_obj])
+    assert stats["objects"] == 1
+    assert stix_obj["name"] is sys.intern("Enterprise ATT&CK")
+
+
+def test_load_bundle_with_unregistered_custom_type(tmp_path: Path) -> None:
+    bundle = synthetic_bundle(groups=3, techniques=10, software=3)
+    bundle["objects"].append(COLLECTION)
+    bundle_path = tmp_path.joinpath("bundle.json")
+    bundle_path.write_text(json.dumps(bundle))
+
+    manager = AttckStixManager(str(bundle_path), compact=True)
+
+    assert manager.compaction_stats["objects"] == len(bundle["objects"])
+    assert len(manager.get_groups()) == 3
@@ -0,0 +1,117 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from attck_stix_agent.api._http_cache import HttpCache
+
+IDENTITY = {"Accept-Encoding": "identity"}
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def _client(cache: HttpCache, state: dict) -> TestClient:
+    app = FastAPI()
+    app.middleware("http")(cache)
+
+    @app.get("/items")
+    def items(n: int = 100) -> list[str]:
+        state["calls"] += 1
+        return [f"item-{i}" for i in range(n)]
+
+    @app.patch("/toggle")
+    def toggle() -> None:
+        state["version"] += 1
+
+    @app.get("/toggle-during-read")
+    def toggle_during_read() -> dict[str, int]:
+        state["version"] += 1
+        return {"version": state["version"]}
+
+    return TestClient(app)
+
+
+def _setup(max_bytes: int | None = None) -> tuple[HttpCache, dict, TestClient]:
+    state = {"calls": 0, "version": 0}
+    cache = HttpCache(version=lambda: str(state["version"]), max_bytes=max_bytes)
+    return cache, state, _client(cache, state)
+
+
+def test_not_modified() -> None:
+    _, state, client = _setup()
+    resp = client.get("/items", headers=IDENTITY)
+    etag = resp.headers["ETag"]
+    assert resp.status_code == 200
+
+    resp = client.get("/items", headers={**IDENTITY, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+    assert state["calls"] == 1
+
+    client.patch("/toggle")
+    resp = client.get("/items", headers={**IDENTITY, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert state["calls"] == 2
+
+
+def test_wildcard_requires_cached_response() -> None:
+    _, state, client = _setup()
+    headers = {**IDENTITY, "If-None-Match": "*"}
+    assert client.get("/missing", headers=headers).status_code == 404
+    assert client.get("/items?n=x", headers=headers).status_code == 422
+    assert state["calls"] == 0
+    assert client.get("/items", headers=headers).status_code == 304
+    assert state["calls"] == 1
+    assert client.get("/items", headers=headers).status_code == 304
+    assert state["calls"] == 1
+
+
+def test_etag_per_content_coding() -> None:
+    _, _, client = _setup()
+    identity = client.get("/items", headers=IDENTITY)
+    gzipped = client.get("/items", headers=GZIP)
+    assert "Content-Encoding" not in identity.headers
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["ETag"] == f'{identity.headers["ETag"][:-1]}-gzip"'
+    assert gzipped.content == identity.content
+
+    headers = {**GZIP, "If-None-Match": identity.headers["ETag"]}
+    assert client.get("/items", headers=headers).status_code == 200
+    headers = {**GZIP, "If-None-Match": gzipped.headers["ETag"]}
+    assert client.get("/items", headers=headers).status_code == 304
+
+
+def test_undeclared_params_share_entry() -> None:
+    _, state, client = _setup()
+    etag = client.get("/items", headers=IDENTITY).headers["ETag"]
+    assert client.get("/items?junk=1", headers=IDENTITY).headers["ETag"] == etag
+    assert client.get("/items?junk=2", headers=IDENTITY).headers["ETag"] == etag
+    assert state["calls"] == 1
+    assert client.get("/items?n=5", headers=IDENTITY).headers["ETag"] != etag
+    assert state["calls"] == 2
+
+
+def test_evicts_by_bytes() -> None:
+    cache = HttpCache(version=lambda: "", max_bytes=1000)
+    for i in range(5):
+        cache.store(f'"{i}"', b"x" * 300, "text/plain")
+        assert cache.size <= cache.max_bytes
+    assert cache.get('"0"') is None
+    assert cache.get('"1"') is None
+    # Marks "2" as recently used, so "3" is evicted next.
+    assert cache.get('"2"') is not None
+    cache.store('"5"', b"x" * 300, "text/plain")
+    assert cache.get('"3"') is None
+    assert all(cache.get(etag) is not None for etag in ('"2"', '"4"', '"5"'))
+    assert cache.size == 900
+
+    cache.store('"big"', b"x" * 2000, "text/plain")
+    assert cache.get('"big"') is None
+    assert cache.size == 900
+
+
+def test_skips_store_when_version_changes() -> None:
+    cache, _, client = _setup()
+    resp = client.get("/toggle-during-read", headers=IDENTITY)
+    assert resp.status_code == 200
+    assert resp.json() == {"version": 1}
+    assert "ETag" not in resp.headers
+    assert cache.size == 0
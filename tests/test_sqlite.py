@@ -0,0 +1,167 @@
+import importlib
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+import stix2
+from fastapi.testclient import TestClient
+from stix2 import Filter
+
+from attck_stix_agent._sqlite import SQLiteStore
+from attck_stix_agent._stix import StixImporter
+from attck_stix_agent.api import HTTP_CACHE_ENV, STIX_SRC_ENV
+from attck_stix_agent.attck import AttckStixManager
+from attck_stix_agent.bench import synthetic_bundle
+
+
+@pytest.fixture(scope="module")
+def bundle_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    bundle = synthetic_bundle(groups=8, techniques=40, software=12, seed=1)
+    bundle_path = tmp_path_factory.mktemp("bundle").joinpath("bundle.json")
+    bundle_path.write_text(json.dumps(bundle))
+    return bundle_path
+
+
+@pytest.fixture(scope="module")
+def api_module(bundle_path: Path) -> Iterator[ModuleType]:
+    # The API loads its manager when imported; each test swaps in its own.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv(STIX_SRC_ENV, str(bundle_path))
+        mp.setenv(HTTP_CACHE_ENV, "0")
+        yield importlib.import_module("attck_stix_agent.api.api")
+
+
+def _ids(stix_objs: list) -> list[str]:
+    return sorted(stix_obj["id"] for stix_obj in stix_objs)
+
+
+def test_query_matches_memory_store(bundle_path: Path, tmp_path: Path) -> None:
+    importer = StixImporter(allow_custom=True)
+    memory_store = importer(str(bundle_path))
+    sqlite_store = importer.to_sqlite(str(bundle_path), tmp_path.joinpath("s.db"))
+
+    group_id = _ids(memory_store.query([Filter("type", "=", "intrusion-set")]))[0]
+    technique_id = _ids(memory_store.query([Filter("type", "=", "attack-pattern")]))[0]
+    queries = [
+        [Filter("type", "=", "intrusion-set")],
+        [Filter("type", "in", ("malware", "tool"))],
+        [Filter("id", "=", group_id)],
+        [
+            Filter("type", "=", "relationship"),
+            Filter("relationship_type", "=", "uses"),
+            Filter("source_ref", "=", group_id),
+        ],
+        [Filter("type", "=", "relationship"), Filter("target_ref", "=", technique_id)],
+        [
+            Filter("type", "=", "attack-pattern"),
+            Filter("x_mitre_is_subtechnique", "=", True),
+        ],
+    ]
+    for query in queries:
+        expected = _ids(memory_store.query(query))
+        assert expected
+        assert _ids(sqlite_store.query(query)) == expected
+    sqlite_store.source.close()
+
+
+def test_keeps_latest_active_version(tmp_path: Path) -> None:
+    group = {
+        "type": "intrusion-set",
+        "id": "intrusion-set--899ce53f-13a0-479b-a0e4-67d46e241542",
+        "created": "2020-01-01T00:00:00.000Z",
+        "modified": "2020-01-01T00:00:00.000Z",
+        "name": "Old",
+    }
+    revoked = {
+        **group,
+        "id": "intrusion-set--3753cc21-2dae-4dfb-8481-d004e74502cc",
+        "revoked": True,
+    }
+    stix_objs = [
+        stix2.parse(obj, version="2.0")
+        for obj in (
+            {**group, "modified": "2021-01-01T00:00:00.000Z", "name": "New"},
+            group,
+            revoked,
+        )
+    ]
+    store = SQLiteStore.create(tmp_path.joinpath("s.db"), stix_objs)
+
+    stored_ids = [stix_id for stix_id, _ in store.source.object_versions()]
+    assert stored_ids == sorted([group["id"], revoked["id"]])
+    assert store.get(group["id"])["name"] == "New"
+    assert store.source.active_ids() == [group["id"]]
+    assert list(tmp_path.iterdir()) == [tmp_path.joinpath("s.db")]
+    store.source.close()
+
+
+def _normalized(body: object) -> object:
+    if isinstance(body, list):
+        return sorted(json.dumps(item, sort_keys=True) for item in body)
+    return body
+
+
+def test_endpoints_match_memory(
+    api_module: ModuleType, bundle_path: Path, tmp_path: Path
+) -> None:
+    memory_manager = AttckStixManager(str(bundle_path))
+    sqlite_manager = AttckStixManager(
+        str(bundle_path), sqlite_path=tmp_path.joinpath("s.db"), object_cache_size=16
+    )
+    group_id = _ids(memory_manager.get_groups())[0]
+    technique_id = _ids(memory_manager.get_techniques())[0]
+    paths = [
+        "/groups",
+        f"/group/{group_id}",
+        f"/group/{group_id}/techniques",
+        f"/group/{group_id}/techniques?nested=true",
+        f"/group/{group_id}/techniques?transitive=true",
+        f"/group/{group_id}/software",
+        f"/group/{group_id}/coverage",
+        f"/path/{group_id}?hop=uses:attack-pattern&hop=~uses:intrusion-set",
+        "/platforms",
+        "/tactics",
+        "/closures",
+        "/techniques?q=subtechnique:false",
+        f"/technique/{technique_id}/similar",
+    ]
+
+    responses: list[dict[str, object]] = []
+    for manager in (memory_manager, sqlite_manager):
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(api_module, "stix_manager", manager)
+            client = TestClient(api_module.api)
+            responses.append({})
+            for path in paths:
+                resp = client.get(path)
+                assert resp.status_code == 200, path
+                responses[-1][path] = _normalized(resp.json())
+    assert responses[0] == responses[1]
+    sqlite_store = sqlite_manager.sqlite_store
+    assert sqlite_store is not None
+    assert sqlite_store.source.cache_info()["size"] <= 16
+
+
+def test_rebuilds_when_source_changes(bundle_path: Path, tmp_path: Path) -> None:
+    stix_path = tmp_path.joinpath("bundle.json")
+    bundle = json.loads(bundle_path.read_text())
+    stix_path.write_text(json.dumps(bundle))
+    db_path = tmp_path.joinpath("s.db")
+
+    def load() -> tuple[int, int]:
+        manager = AttckStixManager(str(stix_path), sqlite_path=db_path)
+        return db_path.stat().st_mtime_ns, len(manager.get_groups())
+
+    built, group_count = load()
+    assert load() == (built, group_count)
+
+    group_ids = [
+        obj["id"] for obj in bundle["objects"] if obj["type"] == "intrusion-set"
+    ]
+    bundle["objects"] = [obj for obj in bundle["objects"] if obj["id"] != group_ids[0]]
+    stix_path.write_text(json.dumps(bundle))
+    rebuilt, rebuilt_count = load()
+    assert rebuilt != built
+    assert rebuilt_count == group_count - 1
@@ -0,0 +1,96 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+from attck_stix_agent.attck.attck_graph import AttckGraph
+from attck_stix_agent.attck.attck_timeline import AttckCampaignTimeline
+
+
+def _campaign(name: str, first_seen: str | None, last_seen: str | None) -> dict:
+    campaign = {"type": "campaign", "id": f"campaign--{name}", "name": name}
+    if first_seen is not None:
+        campaign["first_seen"] = first_seen
+    if last_seen is not None:
+        campaign["last_seen"] = last_seen
+    return campaign
+
+
+def _timeline(campaigns: list[dict]) -> AttckCampaignTimeline:
+    graph = AttckGraph(
+        objects={campaign["id"]: campaign for campaign in campaigns}, edges=[]
+    )
+    return AttckCampaignTimeline(graph)
+
+
+def _ids(timeline: AttckCampaignTimeline, start=None, end=None) -> list[str]:
+    return [campaign.id for campaign in timeline.between(start, end)]
+
+
+TIMELINE = _timeline(
+    [
+        _campaign("bounded", "2021-01-01T00:00:00Z", "2021-06-01T00:00:00Z"),
+        _campaign("no-end", "2022-01-01T00:00:00Z", None),
+        _campaign("no-start", None, "2020-06-01T00:00:00Z"),
+        _campaign("always", None, None),
+    ]
+)
+
+
+def _at(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=UTC)
+
+
+def test_between_includes_edges() -> None:
+    assert _ids(TIMELINE, _at("2021-06-01"), _at("2021-06-01")) == [
+        "campaign--always",
+        "campaign--bounded",
+    ]
+    assert _ids(TIMELINE, end=_at("2021-01-01")) == [
+        "campaign--no-start",
+        "campaign--always",
+        "campaign--bounded",
+    ]
+    assert _ids(TIMELINE, _at("2020-06-01"), _at("2020-06-01")) == [
+        "campaign--no-start",
+        "campaign--always",
+    ]
+    just_after = _at("2021-06-01") + timedelta(microseconds=1)
+    assert _ids(TIMELINE, just_after, _at("2021-12-31")) == ["campaign--always"]
+
+
+def test_between_open_ended() -> None:
+    assert _ids(TIMELINE, _at("2030-01-01")) == [
+        "campaign--always",
+        "campaign--no-end",
+    ]
+    assert _ids(TIMELINE, end=_at("1990-01-01")) == [
+        "campaign--no-start",
+        "campaign--always",
+    ]
+    assert len(_ids(TIMELINE)) == 4
+    assert _ids(TIMELINE, _at("2022-01-01"), _at("2021-01-01")) == []
+
+
+def test_between_matches_linear_scan() -> None:
+    rng = random.Random(0)  # noqa: S311
+    origin = _at("2020-01-01")
+    campaigns: list[dict] = []
+    for i in range(200):
+        start = origin + timedelta(days=rng.randrange(1000))
+        end = start + timedelta(days=rng.randrange(100))
+        campaigns.append(
+            _campaign(
+                str(i),
+                None if i % 17 == 0 else start.isoformat(),
+                None if i % 13 == 0 else end.isoformat(),
+            )
+        )
+    timeline = _timeline(campaigns)
+    for _ in range(200):
+        start = origin + timedelta(days=rng.randrange(-50, 1150))
+        end = start + timedelta(days=rng.randrange(60))
+        expected = [
+            interval.id
+            for interval in timeline.intervals
+            if interval.start <= end and interval.end >= start
+        ]
+        assert _ids(timeline, start, end) == expected